@@ -0,0 +1,205 @@
+"""
+Benchmark de concurrencia: lectura síncrona (Flask) frente a asíncrona (Quart).
+
+Crea una base de datos SQLite temporal con artículos de prueba y añade a cada
+SELECT una latencia simulada de red (--latencia), dentro del hilo que ejecuta
+la consulta, como ocurriría esperando a MySQL. Después lanza N peticiones
+simultáneas a la lista de artículos en cada modo:
+
+- Síncrono: la aplicación Flask de `main.py` atendida por un número fijo de
+  hilos (--hilos), como un servidor WSGI con hilos.
+- Asíncrono: la aplicación Quart de `main_async.py` en un único bucle de eventos.
+
+Para cada nivel de concurrencia muestra el tiempo total, el throughput y la
+latencia media. Mientras el modo síncrono se estanca en hilos / latencia
+peticiones por segundo, el asíncrono escala hasta que la base de datos o la
+CPU se saturan.
+
+Uso:
+    python bench_async.py --latencia 0.05 --hilos 16 --concurrencias 16,64,256
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from config import Config
+
+RUTA_SINCRONA = '/articulos/articulos/'
+RUTA_ASINCRONA = '/api/articulos'
+
+
+def _configurar(ruta_bd, hilos, concurrencia_maxima):
+    """
+    Apunta ambas aplicaciones a la base de datos SQLite temporal.
+
+    Cada pool se dimensiona para que no sea el cuello de botella: tantas
+    conexiones como hilos en modo síncrono y como peticiones simultáneas en
+    modo asíncrono.
+
+    :param ruta_bd: Ruta del fichero SQLite.
+    :param hilos: Hilos del servidor síncrono.
+    :param concurrencia_maxima: Mayor nivel de concurrencia del benchmark.
+    """
+    Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{ruta_bd}'
+    Config.SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': hilos, 'max_overflow': 0}
+    Config.SQLALCHEMY_ASYNC_DATABASE_URI = f'sqlite+aiosqlite:///{ruta_bd}'
+    Config.SQLALCHEMY_ASYNC_ENGINE_OPTIONS = {
+        'pool_size': concurrencia_maxima, 'max_overflow': 0
+    }
+    Config.ADMISION_HABILITADA = False  # El benchmark mide el servidor, no el rate limiting
+
+
+def _callback_latencia(latencia):
+    """
+    Crea el callback de traza de sqlite3 que retrasa cada SELECT.
+
+    sqlite3 invoca el callback en el hilo que ejecuta la sentencia: el hilo de
+    la petición en modo síncrono y el hilo propio de cada conexión de aiosqlite
+    en modo asíncrono, sin bloquear el bucle de eventos.
+
+    :param latencia: Segundos de espera por consulta.
+    :return: Función para `set_trace_callback`.
+    """
+    def callback(sentencia):
+        if sentencia.lstrip().upper().startswith('SELECT'):
+            time.sleep(latencia)
+    return callback
+
+
+def _poblar(db, articulos):
+    """
+    Crea las tablas y carga los artículos de prueba.
+
+    :param db: Instancia de Flask-SQLAlchemy.
+    :param articulos: Número de artículos a crear.
+    """
+    from src.models.model_articulo import Articulo
+
+    db.create_all()
+    hoy = datetime.date.today()
+    db.session.add_all(
+        Articulo(
+            codigo_articulo=f'A{i:05d}', seccion='Ferretería', nombre_articulo=f'Artículo {i}',
+            precio=1 + i % 100, fecha=hoy, importado=i % 2, pais_origen='España',
+        )
+        for i in range(articulos)
+    )
+    db.session.commit()
+
+
+def medir_sincrono(app, concurrencia, hilos):
+    """
+    Lanza `concurrencia` peticiones simultáneas a la aplicación síncrona.
+
+    :return: Tupla (segundos totales, peticiones correctas, latencia media).
+    """
+    def peticion(enviada):
+        respuesta = app.test_client().get(RUTA_SINCRONA)
+        return respuesta.status_code == 200, time.perf_counter() - enviada
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        # La latencia se mide desde el envío, como en modo asíncrono: incluye la espera por un hilo
+        futuros = [ejecutor.submit(peticion, time.perf_counter()) for _ in range(concurrencia)]
+        resultados = [futuro.result() for futuro in futuros]
+    return _resumir(time.perf_counter() - inicio, resultados)
+
+
+async def medir_asincrono(app, concurrencia):
+    """
+    Lanza `concurrencia` peticiones simultáneas a la aplicación asíncrona.
+
+    :return: Tupla (segundos totales, peticiones correctas, latencia media).
+    """
+    cliente = app.test_client()
+
+    async def peticion(enviada):
+        respuesta = await cliente.get(RUTA_ASINCRONA)
+        return respuesta.status_code == 200, time.perf_counter() - enviada
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(peticion(time.perf_counter()) for _ in range(concurrencia))
+    )
+    return _resumir(time.perf_counter() - inicio, resultados)
+
+
+def _resumir(total, resultados):
+    correctas = sum(1 for correcta, _ in resultados if correcta)
+    media = sum(segundos for _, segundos in resultados) / len(resultados)
+    return total, correctas, media
+
+
+async def _ejecutar_asincrono(app, concurrencias, latencia):
+    """
+    Ejecuta todos los niveles de concurrencia dentro del ciclo de vida de la app Quart.
+    """
+    from src.asincrono.db_async import db_async
+
+    resultados = []
+    async with app.test_app():
+        callback = _callback_latencia(latencia)
+
+        @event.listens_for(db_async.engine.sync_engine, 'connect')
+        def al_conectar(conexion_dbapi, registro):
+            conexion_dbapi.run_async(lambda conexion: conexion.set_trace_callback(callback))
+
+        for concurrencia in concurrencias:
+            resultados.append(await medir_asincrono(app, concurrencia))
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de lectura síncrona frente a asíncrona.')
+    parser.add_argument('--latencia', type=float, default=0.05,
+                        help='Latencia simulada por consulta en segundos')
+    parser.add_argument('--hilos', type=int, default=16,
+                        help='Hilos del servidor síncrono')
+    parser.add_argument('--concurrencias', default='16,64,256',
+                        help='Niveles de peticiones simultáneas separados por comas')
+    parser.add_argument('--articulos', type=int, default=20, help='Artículos de prueba')
+    args = parser.parse_args(argv)
+    concurrencias = [int(valor) for valor in args.concurrencias.split(',')]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        _configurar(
+            os.path.join(directorio, 'bench.sqlite3'), args.hilos, max(concurrencias)
+        )
+        from extensions import db
+        from main import app as app_sincrona
+        from main_async import app as app_asincrona
+
+        with app_sincrona.app_context():
+            _poblar(db, args.articulos)
+            db.engine.dispose()  # Las conexiones nuevas ya tendrán la latencia simulada
+            event.listen(
+                db.engine, 'connect',
+                lambda conexion_dbapi, registro: conexion_dbapi.set_trace_callback(
+                    _callback_latencia(args.latencia)
+                )
+            )
+        sincronos = [medir_sincrono(app_sincrona, c, args.hilos) for c in concurrencias]
+        asincronos = asyncio.run(_ejecutar_asincrono(app_asincrona, concurrencias, args.latencia))
+
+    print(f'Latencia simulada por consulta: {args.latencia * 1000:.0f} ms, '
+          f'hilos síncronos: {args.hilos}, artículos: {args.articulos}\n')
+    print(f"{'modo':<10}{'concurrencia':>14}{'total_s':>10}{'correctas':>11}"
+          f"{'rps':>10}{'media_ms':>10}")
+    for modo, resultados in (('sincrono', sincronos), ('asincrono', asincronos)):
+        for concurrencia, (total, correctas, media) in zip(concurrencias, resultados):
+            print(f'{modo:<10}{concurrencia:>14}{total:>10.2f}{correctas:>11}'
+                  f'{correctas / total:>10.1f}{media * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
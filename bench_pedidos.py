@@ -0,0 +1,182 @@
+"""
+Benchmark de creación de pedidos multilínea según el número de líneas.
+
+Crea una base de datos SQLite temporal con artículos y un cliente de prueba y
+añade a cada sentencia una latencia simulada de ida y vuelta a la base de
+datos (--latencia), como ocurriría con MySQL en otra máquina. Para cada
+tamaño de pedido mide la latencia de dos implementaciones:
+
+- multilinea: la ruta `/pedidos/carrito`, que valida con una consulta y
+  escribe todas las líneas con un único INSERT.
+- por_linea: referencia ingenua que consulta e inserta cada línea por
+  separado (un SELECT y un INSERT por línea) dentro de la misma transacción.
+
+Muestra, por tamaño e implementación, las sentencias ejecutadas y las
+latencias p50/p95 del pedido completo.
+
+Uso:
+    python bench_pedidos.py --latencia 0.002 --lineas 1,10,100,500 --repeticiones 10
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import argparse
+import datetime
+import math
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from config import Config
+
+CODIGO_CLIENTE = 'C0001'
+
+
+def _configurar(ruta_bd, max_lineas):
+    """
+    Apunta la aplicación a la base de datos SQLite temporal.
+
+    :param ruta_bd: Ruta del fichero SQLite.
+    :param max_lineas: Mayor tamaño de pedido del benchmark.
+    """
+    Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{ruta_bd}'
+    Config.SQLALCHEMY_ENGINE_OPTIONS = {}
+    Config.PEDIDO_MAX_LINEAS = max(Config.PEDIDO_MAX_LINEAS, max_lineas)
+    Config.ADMISION_HABILITADA = False  # El benchmark mide el pedido, no el rate limiting
+
+
+def _poblar(db, articulos):
+    """
+    Crea las tablas, los artículos y el cliente de prueba.
+
+    :param db: Instancia de Flask-SQLAlchemy.
+    :param articulos: Número de artículos a crear.
+    """
+    from src.models.model_articulo import Articulo
+    from src.models.model_cliente import Cliente
+
+    db.create_all()
+    hoy = datetime.date.today()
+    db.session.add(Cliente(codigoCliente=CODIGO_CLIENTE, empresa='Cliente de prueba'))
+    db.session.add_all(
+        Articulo(
+            codigo_articulo=f'A{i:05d}', seccion='Ferretería', nombre_articulo=f'Artículo {i}',
+            precio=1 + i % 100, fecha=hoy, importado=i % 2, pais_origen='España',
+        )
+        for i in range(articulos)
+    )
+    db.session.commit()
+
+
+def _percentil(ordenadas, p):
+    """
+    Percentil por el método del rango más cercano.
+    """
+    indice = max(int(math.ceil(p / 100 * len(ordenadas))) - 1, 0)
+    return ordenadas[indice]
+
+
+def pedido_por_linea(db, lineas):
+    """
+    Implementación de referencia: una consulta y un INSERT por cada línea.
+
+    :param db: Instancia de Flask-SQLAlchemy.
+    :param lineas: Lista de tuplas (codigo_articulo, cantidad).
+    """
+    from src.models.model_articulo import Articulo
+    from src.models.model_cliente import Cliente
+    from src.models.model_pedido import Pedido
+
+    if db.session.get(Cliente, CODIGO_CLIENTE) is None:
+        raise ValueError('Cliente inexistente')
+    hoy = datetime.date.today()
+    for codigo_articulo, cantidad in lineas:
+        articulo = db.session.get(Articulo, codigo_articulo)
+        db.session.add(Pedido(
+            codigoCliente=CODIGO_CLIENTE, codigo_articulo=codigo_articulo, cantidad=cantidad,
+            precio_unitario=articulo.precio, fecha_pedido=hoy,
+        ))
+        db.session.flush()
+    db.session.commit()
+
+
+def medir(app, db, implementacion, lineas, repeticiones, contador):
+    """
+    Crea `repeticiones` pedidos con la implementación indicada.
+
+    :return: Tupla (sentencias por pedido, latencias ordenadas en segundos).
+    """
+    cliente = app.test_client()
+    cuerpo = {
+        'codigoCliente': CODIGO_CLIENTE,
+        'lineas': [{'codigo_articulo': codigo, 'cantidad': 1} for codigo, _ in lineas],
+    }
+    latencias = []
+    sentencias = 0
+    for _ in range(repeticiones):
+        contador[0] = 0
+        inicio = time.perf_counter()
+        if implementacion == 'multilinea':
+            respuesta = cliente.post('/pedidos/carrito', json=cuerpo)
+            if respuesta.status_code != 201:
+                raise RuntimeError(respuesta.get_json())
+        else:
+            with app.app_context():
+                pedido_por_linea(db, lineas)
+        latencias.append(time.perf_counter() - inicio)
+        sentencias = contador[0]
+    return sentencias, sorted(latencias)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de pedidos multilínea.')
+    parser.add_argument('--latencia', type=float, default=0.002,
+                        help='Latencia simulada por sentencia en segundos')
+    parser.add_argument('--lineas', default='1,10,100,500',
+                        help='Tamaños de pedido separados por comas')
+    parser.add_argument('--repeticiones', type=int, default=10,
+                        help='Pedidos creados por tamaño e implementación')
+    args = parser.parse_args(argv)
+    tamanos = [int(valor) for valor in args.lineas.split(',')]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        _configurar(os.path.join(directorio, 'bench.sqlite3'), max(tamanos))
+        from extensions import db
+        from main import app
+
+        contador = [0]
+        with app.app_context():
+            _poblar(db, max(tamanos))
+            db.engine.dispose()  # Las conexiones nuevas ya tendrán la latencia simulada
+
+            def al_conectar(conexion_dbapi, registro):
+                conexion_dbapi.set_trace_callback(lambda sentencia: time.sleep(args.latencia))
+
+            def al_ejecutar(conn, cursor, statement, parameters, context, executemany):
+                contador[0] += 1
+
+            event.listen(db.engine, 'connect', al_conectar)
+            event.listen(db.engine, 'before_cursor_execute', al_ejecutar)
+
+        resultados = []
+        for tamano in tamanos:
+            lineas = [(f'A{i:05d}', 1) for i in range(tamano)]
+            for implementacion in ('multilinea', 'por_linea'):
+                sentencias, latencias = medir(
+                    app, db, implementacion, lineas, args.repeticiones, contador
+                )
+                resultados.append((tamano, implementacion, sentencias, latencias))
+
+    print(f'Latencia simulada por sentencia: {args.latencia * 1000:.1f} ms, '
+          f'repeticiones: {args.repeticiones}\n')
+    print(f"{'lineas':>8}  {'implementacion':<16}{'sentencias':>12}{'p50_ms':>10}{'p95_ms':>10}")
+    for tamano, implementacion, sentencias, latencias in resultados:
+        print(f'{tamano:>8}  {implementacion:<16}{sentencias:>12}'
+              f'{_percentil(latencias, 50) * 1000:>10.1f}{_percentil(latencias, 95) * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -39,11 +39,66 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Desactiva el seguimiento de modificaciones
 
+    # Configuración del motor asíncrono de SQLAlchemy para la API de lectura (main_async.py)
+    ASYNC_POOL_SIZE = int(os.getenv('ASYNC_POOL_SIZE', 20))  # Conexiones asíncronas simultáneas
+    SQLALCHEMY_ASYNC_DATABASE_URI = os.getenv(
+        'ASYNC_DATABASE_URI',
+        f"mysql+aiomysql://{USERNAME}:{PASSWORD}@{HOST}:{DB_PORT}/{DATABASE}"
+    )
+    SQLALCHEMY_ASYNC_ENGINE_OPTIONS = {
+        'pool_size': ASYNC_POOL_SIZE,
+        'pool_recycle': 3600,  # Evita conexiones cerradas por wait_timeout de MySQL
+    }
+
     # Configuración del pool de conexiones MySQL
     POOL_SIZE = int(os.getenv('POOL_SIZE', 5))  # Tamaño del pool de conexiones
     POOL_NAME = os.getenv('POOL_NAME', 'default_pool')  # Nombre del pool
     pool = None  # Instancia del pool de conexiones
 
+    # Configuración de la sincronización incremental del catálogo
+    SYNC_TAMANO_LOTE = int(os.getenv('SYNC_TAMANO_LOTE', 500))  # Cambios por lote por defecto
+    SYNC_TAMANO_LOTE_MAX = int(os.getenv('SYNC_TAMANO_LOTE_MAX', 5000))  # Máximo permitido por lote
+
+    # Número máximo de líneas de un pedido multilínea (carrito)
+    PEDIDO_MAX_LINEAS = int(os.getenv('PEDIDO_MAX_LINEAS', 1000))
+
+    # Configuración del perfilado bajo demanda (desactivado si no hay token ni muestreo)
+    PERFILADO_TOKEN = os.getenv('PERFILADO_TOKEN')  # Token para la cabecera y la página de perfiles
+    PERFILADO_CABECERA = os.getenv('PERFILADO_CABECERA', 'X-Perfilar')  # Cabecera que activa el perfil
+    PERFILADO_TASA = float(os.getenv('PERFILADO_TASA', 0))  # Fracción de peticiones muestreadas (0-1)
+    PERFILADO_DIR = os.getenv('PERFILADO_DIR', 'perfiles')  # Directorio del anillo de perfiles
+    PERFILADO_MAX = int(os.getenv('PERFILADO_MAX', 100))  # Perfiles conservados como máximo
+    # Segundos que dura el acceso a /admin/perfiles/ tras autenticarse con ?token=
+    PERFILADO_SESION_DURACION = int(os.getenv('PERFILADO_SESION_DURACION', 3600))
+    # Guarda los valores de los parámetros SQL (pueden contener datos de clientes)
+    PERFILADO_GUARDAR_PARAMETROS = os.getenv('PERFILADO_GUARDAR_PARAMETROS', '0') == '1'
+
+    # Configuración del control de admisión para rutas costosas
+    ADMISION_HABILITADA = os.getenv('ADMISION_HABILITADA', '1') == '1'  # Activa/desactiva el control
+    ADMISION_BACKEND = os.getenv('ADMISION_BACKEND', 'memoria')  # 'memoria' o 'sqlite'
+    ADMISION_SQLITE_RUTA = os.getenv('ADMISION_SQLITE_RUTA', 'admision.sqlite3')  # Estado compartido
+    # Proxies inversos de confianza delante de la app (0 = usar la IP de la conexión)
+    ADMISION_PROXIES = int(os.getenv('ADMISION_PROXIES', 0))
+    ADMISION_CLASES = {
+        # Listados sin paginar y búsquedas con escaneo completo
+        'pesada': {
+            'tasa': float(os.getenv('ADMISION_PESADA_TASA', 2)),  # Peticiones/segundo por cliente
+            'rafaga': int(os.getenv('ADMISION_PESADA_RAFAGA', 10)),  # Ráfaga máxima por cliente
+            'concurrencia': int(os.getenv('ADMISION_PESADA_CONCURRENCIA', POOL_SIZE)),  # En curso
+            'reintento': int(os.getenv('ADMISION_PESADA_REINTENTO', 1)),  # Retry-After para 503
+            # Segundos tras los que un hueco no liberado (worker muerto) se recupera
+            'duracion_maxima': int(os.getenv('ADMISION_PESADA_DURACION_MAXIMA', 60)),
+        },
+        # Lecturas de la API asíncrona: límites propios por cliente, concurrencia según su pool
+        'lectura_async': {
+            'tasa': float(os.getenv('ADMISION_ASYNC_TASA', 50)),  # Peticiones/segundo por cliente
+            'rafaga': int(os.getenv('ADMISION_ASYNC_RAFAGA', 100)),  # Ráfaga máxima por cliente
+            'concurrencia': int(os.getenv('ADMISION_ASYNC_CONCURRENCIA', ASYNC_POOL_SIZE)),
+            'reintento': int(os.getenv('ADMISION_PESADA_REINTENTO', 1)),
+            'duracion_maxima': int(os.getenv('ADMISION_PESADA_DURACION_MAXIMA', 60)),
+        },
+    }
+
     @classmethod
     def obtener_pool(cls):
         """
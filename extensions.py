@@ -3,7 +3,8 @@ Inicialización de extensiones para la aplicación Flask.
 
 Este módulo centraliza la creación de instancias de extensiones que serán
 utilizadas en toda la aplicación, como SQLAlchemy para la base de datos y
-Flask-Migrate para el manejo de migraciones.
+Flask-Migrate para el manejo de migraciones, el control de admisión de
+peticiones costosas y el perfilado bajo demanda.
 
 Autor: Francisco Diaz Guiza
 Fecha: 04/2025
@@ -11,9 +12,17 @@ Fecha: 04/2025
 
 from flask_sqlalchemy import SQLAlchemy  # ORM para manejo de base de datos
 from flask_migrate import Migrate        # Extensión para migraciones de base de datos
+from src.middleware.admision import ControlAdmision  # Control de admisión y rate limiting
+from src.middleware.perfilado import Perfilador  # Perfilado de peticiones bajo demanda
 
 # Instancia global de SQLAlchemy para ser utilizada en los modelos
 db = SQLAlchemy()
 
 # Instancia global de Migrate para manejar migraciones de la base de datos
-migrate = Migrate()
\ No newline at end of file
+migrate = Migrate()
+
+# Instancia global del control de admisión para proteger las rutas costosas
+admision = ControlAdmision()
+
+# Instancia global del perfilador de peticiones (sin hooks si está desactivado)
+perfilador = Perfilador()
@@ -0,0 +1,653 @@
+"""
+Generador de carga para la aplicación de gestión de inventario.
+
+Lanza contra una instancia en ejecución una mezcla ponderada de las rutas
+reales (inicio, listados, búsquedas, edición, eliminación y pedidos) con una
+concurrencia fija o una tasa de llegada objetivo, o bien reproduce un log de
+accesos grabado en producción. Al terminar muestra, por ruta, el throughput,
+las latencias p50/p95/p99 y la tasa de errores.
+
+Solo utiliza la biblioteca estándar, de modo que puede ejecutarse desde
+cualquier máquina sin instalar las dependencias de la aplicación.
+
+Ejemplos:
+    python generador_carga.py --url http://localhost:5000 --concurrencia 20 --duracion 60
+    python generador_carga.py --url http://localhost:5000 --tasa 50 --mezcla buscar=60,articulos=40
+    python generador_carga.py --url http://localhost:5000 --replay access.log --velocidad 2
+    python generador_carga.py --replay access.log --comprobar-log
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from html.parser import HTMLParser
+from http.cookiejar import CookieJar
+
+# Peso por defecto de cada ruta en la mezcla de tráfico
+MEZCLA_POR_DEFECTO = {
+    'inicio': 10,
+    'articulos': 20,
+    'buscar': 35,
+    'editar': 5,
+    'eliminar': 2,
+    'pedidos': 15,
+    'clientes': 13,
+}
+
+# Clasificación de rutas a partir de la ruta de la URL (para la reproducción de logs)
+PATRONES_RUTAS = [
+    ('inicio', re.compile(r'^/$')),
+    ('articulos', re.compile(r'^/articulos/articulos/?$')),
+    ('buscar', re.compile(r'^/articulos/buscar_articulo')),
+    ('editar', re.compile(r'^/articulos/editar_articulo/')),
+    ('eliminar', re.compile(r'^/articulos/eliminar_articulo/')),
+    ('pedidos', re.compile(r'^/pedidos/pedidos/?$')),
+    ('clientes', re.compile(r'^/clientes/clientes/?$')),
+    ('sync', re.compile(r'^/sync/')),
+]
+
+# Formatos de log admitidos: combined/common (nginx, apache, gunicorn) y el de Werkzeug
+PATRON_LOG = re.compile(
+    r'^\S+ \S+ \S+ \[(?P<fecha>[^\]]+)\] "(?P<metodo>[A-Z]+) (?P<ruta>\S+)[^"]*" (?P<estado>\d{3})'
+)
+FORMATOS_FECHA_LOG = ('%d/%b/%Y:%H:%M:%S %z', '%d/%b/%Y %H:%M:%S')
+
+# Códigos de color ANSI con los que Werkzeug resalta las respuestas que no son 200
+PATRON_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+TERMINOS_POR_DEFECTO = ['a', 'mesa', 'silla', 'ferreteria', 'españa', 'china', '1']
+
+
+class _LectorFormulario(HTMLParser):
+    """
+    Extrae los campos <input> de un formulario HTML (nombre y valor).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.campos = {}
+
+    def handle_starttag(self, tag, attrs):
+        atributos = dict(attrs)
+        if tag == 'input' and atributos.get('name') and atributos.get('type') != 'submit':
+            self.campos[atributos['name']] = atributos.get('value') or ''
+
+
+class Estadisticas:
+    """
+    Acumula las muestras de latencia y los resultados por ruta de forma segura entre hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.rechazadas = defaultdict(int)
+        self.no_iniciadas = defaultdict(int)
+        self.inicio = time.perf_counter()
+        self.fin = None
+
+    def registrar(self, ruta, segundos, estado):
+        """
+        Registra el resultado de una petición.
+
+        :param ruta: Nombre de la ruta.
+        :param segundos: Latencia de la petición.
+        :param estado: Código HTTP o None si la petición falló sin respuesta.
+        """
+        with self._lock:
+            self.latencias[ruta].append(segundos)
+            if estado in (429, 503):
+                self.rechazadas[ruta] += 1
+            elif estado is None or estado >= 400:
+                self.errores[ruta] += 1
+
+    def registrar_no_iniciada(self, ruta):
+        """
+        Registra una llegada que no pudo lanzarse a su hora por falta de hilos libres.
+
+        :param ruta: Nombre de la ruta.
+        """
+        with self._lock:
+            self.no_iniciadas[ruta] += 1
+
+    def informe(self):
+        """
+        Calcula el resumen por ruta y el total.
+
+        :return: Diccionario {ruta: métricas}, incluyendo la clave 'TOTAL'.
+        """
+        duracion = (self.fin or time.perf_counter()) - self.inicio
+        resumen = {}
+        with self._lock:
+            todas = []
+            for ruta in sorted(set(self.latencias) | set(self.no_iniciadas)):
+                muestras = self.latencias[ruta]
+                todas.extend(muestras)
+                resumen[ruta] = _metricas(
+                    muestras, self.errores[ruta], self.rechazadas[ruta],
+                    self.no_iniciadas[ruta], duracion
+                )
+            resumen['TOTAL'] = _metricas(
+                todas, sum(self.errores.values()), sum(self.rechazadas.values()),
+                sum(self.no_iniciadas.values()), duracion
+            )
+        return resumen
+
+
+def _percentil(ordenadas, p):
+    """
+    Percentil por el método del rango más cercano.
+
+    :param ordenadas: Lista de valores ordenada de menor a mayor.
+    :param p: Percentil entre 0 y 100.
+    :return: Valor del percentil o 0 si no hay valores.
+    """
+    if not ordenadas:
+        return 0
+    indice = max(int(math.ceil(p / 100 * len(ordenadas))) - 1, 0)
+    return ordenadas[indice]
+
+
+def _metricas(muestras, errores, rechazadas, no_iniciadas, duracion):
+    """
+    Calcula throughput, percentiles de latencia y tasa de error de un conjunto de muestras.
+
+    :return: Diccionario con las métricas (latencias en milisegundos).
+    """
+    ordenadas = sorted(muestras)
+    total = len(ordenadas)
+    return {
+        'peticiones': total,
+        'rps': round(total / duracion, 2) if duracion > 0 else 0,
+        'p50_ms': round(_percentil(ordenadas, 50) * 1000, 1),
+        'p95_ms': round(_percentil(ordenadas, 95) * 1000, 1),
+        'p99_ms': round(_percentil(ordenadas, 99) * 1000, 1),
+        'errores': errores,
+        'rechazadas': rechazadas,
+        'no_iniciadas': no_iniciadas,
+        'tasa_error': round((errores + rechazadas) / total * 100, 2) if total else 0,
+    }
+
+
+class Cliente:
+    """
+    Cliente HTTP de un hilo de carga, con sus propias cookies (necesarias para el CSRF).
+    """
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()),
+            _SinRedirecciones(),
+        )
+
+    def peticion(self, ruta, datos=None, programada=None):
+        """
+        Ejecuta una petición y devuelve el estado, el cuerpo y la latencia.
+
+        :param ruta: Ruta relativa (con query string si procede).
+        :param datos: Diccionario de campos de formulario para enviar por POST.
+        :param programada: Instante (time.perf_counter()) en que debía lanzarse la
+                           petición; si se indica, la latencia se mide desde él e
+                           incluye el retraso en arrancar (evita la omisión coordinada).
+        :return: Tupla (estado o None, cuerpo, segundos).
+        """
+        cuerpo = urllib.parse.urlencode(datos).encode() if datos is not None else None
+        inicio = time.perf_counter() if programada is None else programada
+        try:
+            with self.opener.open(self.base_url + ruta, data=cuerpo, timeout=self.timeout) as r:
+                contenido = r.read()
+                return r.status, contenido, time.perf_counter() - inicio
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, b'', time.perf_counter() - inicio
+        except (urllib.error.URLError, OSError):
+            return None, b'', time.perf_counter() - inicio
+
+
+class _SinRedirecciones(urllib.request.HTTPRedirectHandler):
+    """
+    Evita seguir redirecciones para medir solo la petición lanzada (p. ej. el POST de edición).
+    """
+
+    def http_error_302(self, req, fp, code, msg, headers):
+        return fp
+
+    http_error_301 = http_error_303 = http_error_307 = http_error_308 = http_error_302
+
+
+class Escenario:
+    """
+    Genera las operaciones de la mezcla de tráfico a partir del catálogo real.
+    """
+
+    def __init__(self, mezcla, codigos, terminos, permitir_eliminaciones):
+        self.rutas = [ruta for ruta, peso in mezcla.items() if peso > 0]
+        self.pesos = [mezcla[ruta] for ruta in self.rutas]
+        self.codigos = codigos
+        self.terminos = terminos
+        self.permitir_eliminaciones = permitir_eliminaciones
+        self._lock = threading.Lock()
+
+    def elegir(self):
+        """
+        :return: Nombre de una ruta elegida según los pesos de la mezcla.
+        """
+        return random.choices(self.rutas, weights=self.pesos)[0]
+
+    def _codigo(self, extraer=False):
+        """
+        Devuelve un código de artículo del catálogo.
+
+        :param extraer: Si es True lo retira de la lista (no se eliminará dos veces).
+        :return: Código de artículo o None si el catálogo está vacío.
+        """
+        with self._lock:
+            if not self.codigos:
+                return None
+            if extraer:
+                return self.codigos.pop(random.randrange(len(self.codigos)))
+            return random.choice(self.codigos)
+
+    def ejecutar(self, cliente, ruta, estadisticas, programada=None):
+        """
+        Ejecuta la operación correspondiente a `ruta` y registra sus peticiones.
+
+        :param cliente: Cliente HTTP del hilo.
+        :param ruta: Nombre de la ruta de la mezcla.
+        :param estadisticas: Acumulador de resultados.
+        :param programada: Instante de llegada previsto de la operación (bucle abierto);
+                           la primera petición se mide desde él.
+        """
+        if ruta == 'inicio':
+            self._medir(cliente, ruta, '/', estadisticas, programada=programada)
+        elif ruta == 'articulos':
+            self._medir(cliente, ruta, '/articulos/articulos/', estadisticas, programada=programada)
+        elif ruta == 'pedidos':
+            self._medir(cliente, ruta, '/pedidos/pedidos/', estadisticas, programada=programada)
+        elif ruta == 'clientes':
+            self._medir(cliente, ruta, '/clientes/clientes/', estadisticas, programada=programada)
+        elif ruta == 'buscar':
+            termino = urllib.parse.quote(random.choice(self.terminos))
+            self._medir(cliente, ruta, f'/articulos/buscar_articulo?termino={termino}', estadisticas,
+                        programada=programada)
+        elif ruta == 'editar':
+            self._editar(cliente, estadisticas, programada)
+        elif ruta == 'eliminar':
+            self._eliminar(cliente, estadisticas, programada)
+
+    @staticmethod
+    def _medir(cliente, ruta, url, estadisticas, datos=None, programada=None):
+        estado, cuerpo, segundos = cliente.peticion(url, datos, programada)
+        estadisticas.registrar(ruta, segundos, estado)
+        return estado, cuerpo
+
+    def _editar(self, cliente, estadisticas, programada=None):
+        """
+        Carga el formulario de edición y lo reenvía con los mismos valores (edición idempotente).
+        """
+        codigo = self._codigo()
+        if codigo is None:
+            return
+        url = f'/articulos/editar_articulo/{urllib.parse.quote(codigo)}'
+        estado, cuerpo = self._medir(cliente, 'editar_form', url, estadisticas, programada=programada)
+        if estado != 200:
+            return
+        lector = _LectorFormulario()
+        lector.feed(cuerpo.decode('utf-8', errors='replace'))
+        self._medir(cliente, 'editar', url, estadisticas, datos=lector.campos)
+
+    def _eliminar(self, cliente, estadisticas, programada=None):
+        """
+        Elimina un artículo si se ha permitido; si no, solo carga la página de confirmación.
+        """
+        codigo = self._codigo(extraer=self.permitir_eliminaciones)
+        if codigo is None:
+            return
+        url = f'/articulos/eliminar_articulo/{urllib.parse.quote(codigo)}'
+        datos = {} if self.permitir_eliminaciones else None
+        self._medir(cliente, 'eliminar', url, estadisticas, datos=datos, programada=programada)
+
+
+def descubrir_catalogo(base_url, timeout, max_lotes=20):
+    """
+    Obtiene los códigos y palabras del catálogo para generar peticiones realistas.
+
+    Usa el feed de sincronización y, si no devuelve datos, extrae los códigos
+    de los enlaces de edición del listado de artículos.
+
+    :param base_url: URL base de la instancia.
+    :param timeout: Timeout de cada petición en segundos.
+    :param max_lotes: Número máximo de lotes del feed a leer.
+    :return: Tupla (lista de códigos, lista de términos de búsqueda).
+    """
+    cliente = Cliente(base_url, timeout)
+    codigos, terminos = [], set()
+    cursor = 0
+    for _ in range(max_lotes):
+        estado, cuerpo, _ = cliente.peticion(f'/sync/articulos?since={cursor}')
+        if estado != 200:
+            break
+        lote = json.loads(cuerpo)
+        for cambio in lote['cambios']:
+            datos = cambio.get('datos')
+            if not datos:
+                continue
+            codigos.append(datos['codigo_articulo'])
+            for campo in ('nombre_articulo', 'seccion', 'pais_origen'):
+                terminos.update(
+                    palabra.lower() for palabra in str(datos[campo]).split() if len(palabra) > 2
+                )
+        cursor = lote['cursor']
+        if not lote['hay_mas']:
+            break
+
+    if not codigos:
+        estado, cuerpo, _ = cliente.peticion('/articulos/articulos/')
+        if estado == 200:
+            html = cuerpo.decode('utf-8', errors='replace')
+            codigos = [
+                urllib.parse.unquote(codigo)
+                for codigo in re.findall(r'/editar_articulo/([^"?]+)"', html)
+            ]
+    terminos.update(codigo[:3] for codigo in codigos)
+    return sorted(set(codigos)), sorted(terminos)
+
+
+def leer_log(ruta_log):
+    """
+    Lee un log de accesos y devuelve las peticiones GET/HEAD reproducibles.
+
+    Se eliminan antes los códigos de color ANSI (Werkzeug colorea la línea de
+    petición de redirecciones, 404, 429 y 5xx). Las líneas que no se reconocen
+    se cuentan aparte de las peticiones no reproducibles (POST, etc.) y se
+    devuelve la primera como muestra, para detectar un formato no admitido.
+
+    :param ruta_log: Ruta del fichero de log.
+    :return: Tupla (lista de (segundos desde el inicio, ruta), número de líneas
+             no reproducibles, número de líneas no reconocidas, primera línea no
+             reconocida o None).
+    """
+    peticiones, descartadas, no_reconocidas, muestra, origen = [], 0, 0, None, None
+    with open(ruta_log, encoding='utf-8', errors='replace') as fichero:
+        for linea in fichero:
+            linea = PATRON_ANSI.sub('', linea).rstrip('\n')
+            if not linea.strip():
+                continue
+            coincidencia = PATRON_LOG.match(linea)
+            instante = _parsear_fecha_log(coincidencia['fecha']) if coincidencia else None
+            if instante is None:
+                no_reconocidas += 1
+                muestra = linea if muestra is None else muestra
+                continue
+            if coincidencia['metodo'] not in ('GET', 'HEAD'):
+                descartadas += 1
+                continue
+            origen = instante if origen is None else origen
+            peticiones.append(((instante - origen).total_seconds(), coincidencia['ruta']))
+    peticiones.sort(key=lambda peticion: peticion[0])
+    return peticiones, descartadas, no_reconocidas, muestra
+
+
+def _parsear_fecha_log(texto):
+    for formato in FORMATOS_FECHA_LOG:
+        try:
+            return datetime.strptime(texto, formato).replace(tzinfo=None)
+        except ValueError:
+            continue
+    return None
+
+
+def clasificar(ruta):
+    """
+    :param ruta: Ruta de la URL (con o sin query string).
+    :return: Nombre de la ruta conocida o 'otras'.
+    """
+    camino = urllib.parse.urlsplit(ruta).path
+    for nombre, patron in PATRONES_RUTAS:
+        if patron.match(camino):
+            return nombre
+    return 'otras'
+
+
+def _hilo_cliente(args):
+    """
+    Devuelve el cliente HTTP del hilo actual, creándolo la primera vez.
+    """
+    local = _hilo_cliente.local
+    if not hasattr(local, 'cliente'):
+        local.cliente = Cliente(args.url, args.timeout)
+    return local.cliente
+
+
+_hilo_cliente.local = threading.local()
+
+
+def _lanzar_programada(ejecutor, huecos, tarea, ruta, estadisticas):
+    """
+    Lanza una llegada del bucle abierto si hay un hilo libre; si no, la cuenta como no iniciada.
+
+    Así la cola no crece sin límite cuando el servidor no da abasto y las
+    llegadas que no pudieron salir a su hora quedan reflejadas en el informe.
+
+    :param ejecutor: ThreadPoolExecutor con `--concurrencia` hilos.
+    :param huecos: Semáforo con tantos huecos como hilos tiene el ejecutor.
+    :param tarea: Función sin argumentos que ejecuta la petición.
+    :param ruta: Nombre de la ruta (para las estadísticas).
+    :param estadisticas: Acumulador de resultados.
+    """
+    if not huecos.acquire(blocking=False):
+        estadisticas.registrar_no_iniciada(ruta)
+        return
+
+    def ejecutar():
+        try:
+            tarea()
+        finally:
+            huecos.release()
+
+    ejecutor.submit(ejecutar)
+
+
+def ejecutar_mezcla(args, escenario, estadisticas):
+    """
+    Ejecuta la mezcla de tráfico en bucle cerrado (concurrencia fija) o abierto (tasa).
+
+    En bucle abierto la latencia se mide desde el instante de llegada previsto,
+    no desde que un hilo recoge la petición, y las llegadas sin hilo libre se
+    cuentan como no iniciadas en lugar de encolarse.
+    """
+    fin = time.perf_counter() + args.duracion
+    restantes = [args.peticiones] if args.peticiones else None
+    lock = threading.Lock()
+
+    def queda_trabajo():
+        if time.perf_counter() >= fin:
+            return False
+        if restantes is None:
+            return True
+        with lock:
+            if restantes[0] <= 0:
+                return False
+            restantes[0] -= 1
+            return True
+
+    def operacion(ruta, programada=None):
+        escenario.ejecutar(_hilo_cliente(args), ruta, estadisticas, programada)
+
+    if args.tasa:
+        # Bucle abierto: llegadas de Poisson, independientes de lo que tarde el servidor
+        huecos = threading.BoundedSemaphore(args.concurrencia)
+        with ThreadPoolExecutor(max_workers=args.concurrencia) as ejecutor:
+            siguiente = time.perf_counter()
+            while True:
+                siguiente += random.expovariate(args.tasa)
+                if siguiente >= fin or not queda_trabajo():
+                    break
+                espera = siguiente - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                ruta = escenario.elegir()
+                _lanzar_programada(
+                    ejecutor, huecos, partial(operacion, ruta, siguiente), ruta, estadisticas
+                )
+    else:
+        def trabajador():
+            while queda_trabajo():
+                operacion(escenario.elegir())
+
+        hilos = [threading.Thread(target=trabajador) for _ in range(args.concurrencia)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+
+def ejecutar_replay(args, peticiones, estadisticas):
+    """
+    Reproduce las peticiones de un log respetando su cadencia original dividida por `velocidad`.
+
+    Con `velocidad` > 0 se comporta como el bucle abierto de `ejecutar_mezcla`:
+    latencia desde el instante previsto y llegadas sin hilo libre como no
+    iniciadas. Con `velocidad` 0 las peticiones se lanzan en cuanto hay hilo.
+    """
+    def lanzar(ruta, programada=None):
+        estado, _, segundos = _hilo_cliente(args).peticion(ruta, programada=programada)
+        estadisticas.registrar(clasificar(ruta), segundos, estado)
+
+    huecos = threading.BoundedSemaphore(args.concurrencia)
+    with ThreadPoolExecutor(max_workers=args.concurrencia) as ejecutor:
+        inicio = time.perf_counter()
+        for desplazamiento, ruta in peticiones:
+            if args.velocidad <= 0:
+                ejecutor.submit(lanzar, ruta)
+                continue
+            programada = inicio + desplazamiento / args.velocidad
+            espera = programada - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+            _lanzar_programada(
+                ejecutor, huecos, partial(lanzar, ruta, programada), clasificar(ruta), estadisticas
+            )
+
+
+def imprimir_informe(resumen):
+    """
+    Muestra el informe por ruta en forma de tabla.
+    """
+    columnas = (
+        'peticiones', 'rps', 'p50_ms', 'p95_ms', 'p99_ms',
+        'errores', 'rechazadas', 'no_iniciadas', 'tasa_error',
+    )
+    print(f"{'ruta':<14}" + ''.join(f'{columna:>14}' for columna in columnas))
+    for ruta, metricas in resumen.items():
+        print(f'{ruta:<14}' + ''.join(f'{metricas[columna]:>14}' for columna in columnas))
+    print('\nrechazadas = respuestas 429/503 del control de admisión; '
+          'no_iniciadas = llegadas sin hilo libre a su hora (subir --concurrencia); tasa_error en %.')
+
+
+def parsear_mezcla(texto):
+    """
+    Convierte 'buscar=60,articulos=40' en un diccionario de pesos.
+
+    :raises argparse.ArgumentTypeError: Si alguna ruta o peso no es válido.
+    """
+    mezcla = dict.fromkeys(MEZCLA_POR_DEFECTO, 0)
+    for parte in texto.split(','):
+        nombre, _, peso = parte.partition('=')
+        nombre = nombre.strip()
+        if nombre not in mezcla:
+            raise argparse.ArgumentTypeError(f'Ruta desconocida en la mezcla: {nombre}')
+        try:
+            mezcla[nombre] = float(peso)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'Peso no válido para {nombre}: {peso}')
+    return mezcla
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Generador de carga con mezcla de tráfico realista o reproducción de logs.'
+    )
+    parser.add_argument('--url', default='http://localhost:5000', help='URL base de la instancia')
+    parser.add_argument('--concurrencia', type=int, default=10,
+                        help='Hilos simultáneos (máximo de peticiones en vuelo)')
+    parser.add_argument('--tasa', type=float, default=0,
+                        help='Tasa de llegada objetivo en peticiones/segundo (bucle abierto)')
+    parser.add_argument('--duracion', type=float, default=30, help='Duración máxima en segundos')
+    parser.add_argument('--peticiones', type=int, default=0,
+                        help='Número máximo de operaciones (0 = sin límite)')
+    parser.add_argument('--mezcla', type=parsear_mezcla, default=dict(MEZCLA_POR_DEFECTO),
+                        help='Pesos por ruta, p. ej. "buscar=60,articulos=40"')
+    parser.add_argument('--terminos', help='Términos de búsqueda separados por comas')
+    parser.add_argument('--permitir-eliminaciones', action='store_true',
+                        help='Elimina artículos de verdad (por defecto solo se carga la confirmación)')
+    parser.add_argument('--replay', help='Log de accesos a reproducir en lugar de la mezcla')
+    parser.add_argument('--comprobar-log', action='store_true',
+                        help='Solo analiza el log de --replay y muestra la mezcla de rutas resultante')
+    parser.add_argument('--velocidad', type=float, default=1,
+                        help='Factor de aceleración del replay (0 = tan rápido como sea posible)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout por petición en segundos')
+    parser.add_argument('--semilla', type=int, help='Semilla aleatoria para repetir una ejecución')
+    parser.add_argument('--json', action='store_true', help='Emite el informe en JSON')
+    args = parser.parse_args(argv)
+
+    if args.semilla is not None:
+        random.seed(args.semilla)
+
+    if args.replay:
+        peticiones, descartadas, no_reconocidas, muestra = leer_log(args.replay)
+        print(f'{len(peticiones)} peticiones reproducibles, {descartadas} no reproducibles '
+              f'(métodos distintos de GET/HEAD), {no_reconocidas} líneas no reconocidas',
+              file=sys.stderr)
+        if muestra is not None:
+            print(f'Primera línea no reconocida: {muestra!r}', file=sys.stderr)
+        if args.comprobar_log:
+            mezcla = defaultdict(int)
+            for _, ruta in peticiones:
+                mezcla[clasificar(ruta)] += 1
+            for ruta, total in sorted(mezcla.items(), key=lambda par: -par[1]):
+                print(f'{ruta:<14}{total:>8}')
+            return
+        estadisticas = Estadisticas()
+        ejecutar_replay(args, peticiones, estadisticas)
+    else:
+        codigos, terminos = descubrir_catalogo(args.url, args.timeout)
+        if args.terminos:
+            terminos = [termino.strip() for termino in args.terminos.split(',') if termino.strip()]
+        terminos = terminos or TERMINOS_POR_DEFECTO
+        print(f'Catálogo: {len(codigos)} artículos, {len(terminos)} términos de búsqueda',
+              file=sys.stderr)
+        escenario = Escenario(args.mezcla, codigos, terminos, args.permitir_eliminaciones)
+        if not escenario.rutas:
+            parser.error('La mezcla no contiene ninguna ruta con peso positivo')
+        estadisticas = Estadisticas()
+        ejecutar_mezcla(args, escenario, estadisticas)
+    estadisticas.fin = time.perf_counter()
+
+    resumen = estadisticas.informe()
+    if args.json:
+        print(json.dumps(resumen, indent=2))
+    else:
+        imprimir_informe(resumen)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,13 @@ Fecha: 04/2025
 from flask import Flask, render_template, url_for  # Flask y utilidades para plantillas y URLs
 from flask_migrate import Migrate  # Extensión para migraciones de base de datos
 from config import Config  # Configuración de la aplicación
-from extensions import db  # Instancia global de SQLAlchemy
+from extensions import db, admision, perfilador  # Instancias globales de las extensiones
 from src.routes.routes_generales import generales_bp  # Blueprint de rutas generales
 from src.routes.routes_articulos import articulos_bp  # Blueprint de rutas de artículos
 from src.routes.routes_pedidos import pedidos_bp  # Blueprint de rutas de pedidos
 from src.routes.routes_clientes import clientes_bp  # Blueprint de rutas de clientes
+from src.routes.routes_sync import sync_bp  # Blueprint de sincronización incremental
+from src.routes.routes_perfiles import perfiles_bp  # Blueprint de administración de perfiles
 import urllib.parse  # Utilidad estándar para manejo de URLs
 from sqlalchemy import text  # Utilidad para ejecutar SQL en SQLAlchemy
 
@@ -40,6 +42,8 @@ def create_app():
     app.register_blueprint(articulos_bp, url_prefix='/articulos')  # Rutas de artículos
     app.register_blueprint(pedidos_bp, url_prefix='/pedidos')  # Rutas de pedidos
     app.register_blueprint(clientes_bp, url_prefix='/clientes')  # Rutas de clientes
+    app.register_blueprint(sync_bp, url_prefix='/sync')  # Feed de cambios del catálogo
+    app.register_blueprint(perfiles_bp, url_prefix='/admin/perfiles')  # Perfiles de peticiones
 
     return app  # Devuelve la instancia de la aplicación
 
@@ -50,11 +54,15 @@ def initialize_extensions(app):
 
     - Inicializa la base de datos con SQLAlchemy.
     - Configura Flask-Migrate para manejar migraciones de la base de datos.
+    - Inicializa el control de admisión de las rutas costosas.
+    - Inicializa el perfilado bajo demanda (solo registra hooks si está habilitado).
 
     :param app: Instancia de la aplicación Flask.
     """
     db.init_app(app)  # Asocia la base de datos con la aplicación Flask
     migrate = Migrate(app, db)  # Configura Flask-Migrate para manejar migraciones
+    admision.init_app(app)  # Crea el backend de estado del control de admisión
+    perfilador.init_app(app)  # Registra los hooks de perfilado si está habilitado
 
 
 # Llama a `create_app` para crear la instancia de la aplicación
@@ -0,0 +1,50 @@
+"""
+Módulo principal de la API de lectura asíncrona.
+
+Crea una aplicación Quart (API compatible con Flask sobre asyncio) que sirve
+los endpoints de lectura de alta concurrencia usando SQLAlchemy asyncio. Se
+ejecuta junto a la aplicación síncrona de `main.py`, con la que comparte la
+configuración y los modelos.
+
+Ejecución:
+    hypercorn main_async:app --bind 0.0.0.0:5001
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+from quart import Quart  # Framework compatible con Flask sobre asyncio
+from config import Config  # Configuración de la aplicación
+from extensions import admision  # Control de admisión compartido con la aplicación síncrona
+from src.asincrono.db_async import db_async  # Motor y sesiones asíncronas
+from src.asincrono.routes_lectura import lectura_bp  # Blueprint de lectura asíncrona
+
+
+def create_app():
+    """
+    Crea e inicializa una instancia de la aplicación asíncrona.
+
+    - Configura la aplicación con los valores definidos en `Config`.
+    - Inicializa el motor asíncrono de la base de datos.
+    - Inicializa el control de admisión de las rutas de lectura.
+    - Registra el blueprint de lectura bajo el prefijo `/api`.
+    - Devuelve la instancia de la aplicación Quart.
+    """
+    app = Quart(__name__)  # Crea la instancia de la aplicación Quart
+    app.config.from_object(Config)  # Carga la configuración desde el archivo `Config`
+
+    db_async.init_app(app)  # Crea el motor asíncrono de SQLAlchemy
+    admision.init_app(app)  # Límites por cliente y de concurrencia
+
+    app.register_blueprint(lectura_bp, url_prefix='/api')  # Rutas de lectura asíncronas
+
+    return app  # Devuelve la instancia de la aplicación
+
+
+# Llama a `create_app` para crear la instancia de la aplicación
+app = create_app()
+
+
+if __name__ == '__main__':
+    # Inicia el servidor de desarrollo de Quart (en producción usar hypercorn)
+    app.run(debug=True, port=5001)
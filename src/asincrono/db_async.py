@@ -0,0 +1,50 @@
+"""
+Acceso asíncrono a la base de datos con SQLAlchemy asyncio.
+
+Este módulo crea el motor asíncrono (aiomysql en producción, aiosqlite en
+local) y la fábrica de sesiones que utiliza la API de lectura asíncrona. Los
+modelos son los mismos de `src/models`: SQLAlchemy permite usarlos con una
+`AsyncSession` sin depender del contexto de aplicación de Flask.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+class BaseDatosAsync:
+    """
+    Extensión que gestiona el motor y las sesiones asíncronas de la aplicación.
+
+    Se inicializa con `init_app(app)` como el resto de extensiones y libera el
+    pool de conexiones al detener el servidor.
+    """
+
+    def __init__(self, app=None):
+        self.engine = None
+        self.sesion = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Crea el motor asíncrono a partir de la configuración de la aplicación.
+
+        :param app: Instancia de la aplicación Quart.
+        """
+        self.engine = create_async_engine(
+            app.config['SQLALCHEMY_ASYNC_DATABASE_URI'],
+            **app.config.get('SQLALCHEMY_ASYNC_ENGINE_OPTIONS', {})
+        )
+        # expire_on_commit=False: los objetos siguen siendo legibles tras cerrar la sesión
+        self.sesion = async_sessionmaker(self.engine, expire_on_commit=False)
+        app.extensions['db_async'] = self
+
+        @app.after_serving
+        async def cerrar_motor():
+            await self.engine.dispose()
+
+
+# Instancia global del acceso asíncrono, usada por las rutas de lectura
+db_async = BaseDatosAsync()
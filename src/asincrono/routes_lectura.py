@@ -0,0 +1,121 @@
+"""
+Rutas de lectura asíncronas para endpoints de alta concurrencia.
+
+Este módulo define una API JSON de solo lectura (artículos, clientes y
+pedidos) sobre SQLAlchemy asyncio. Mientras una petición espera a la base de
+datos, el bucle de eventos atiende otras, de modo que la concurrencia no
+queda limitada por el número de hilos del servidor. Todas las rutas pasan por
+el control de admisión (`limitar_async`) con la clase 'lectura_async', que
+tiene sus propios límites por cliente.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+from quart import Blueprint, jsonify, request
+from sqlalchemy import select
+from extensions import admision
+from src.asincrono.db_async import db_async
+from src.models.model_articulo import Articulo
+from src.models.model_cliente import Cliente
+from src.models.model_pedido import Pedido
+
+# Definición del Blueprint para las rutas de lectura asíncronas
+lectura_bp = Blueprint('lectura', __name__)
+
+
+def _no_encontrado(mensaje):
+    """
+    Construye una respuesta JSON 404.
+
+    :param mensaje: Descripción del recurso no encontrado.
+    :return: Tupla (respuesta, código HTTP).
+    """
+    return jsonify(error=mensaje), 404
+
+
+@lectura_bp.route('/articulos')
+@admision.limitar_async('lectura_async')
+async def articulos_lista():
+    """
+    Ruta para obtener la lista de todos los artículos.
+
+    :return: JSON con la lista de artículos.
+    """
+    async with db_async.sesion() as sesion:
+        articulos = (await sesion.scalars(select(Articulo))).all()
+    return jsonify(articulos=[articulo.serializar() for articulo in articulos])
+
+
+@lectura_bp.route('/articulos/buscar')
+@admision.limitar_async('lectura_async')
+async def buscar_articulo():
+    """
+    Ruta para buscar artículos por cualquier campo relevante.
+
+    Aplica el mismo filtro que la búsqueda de la aplicación síncrona.
+
+    :return: JSON con el término y los artículos encontrados.
+    """
+    termino = request.args.get('termino', '').strip()
+    articulos = []
+    if termino:
+        async with db_async.sesion() as sesion:
+            consulta = select(Articulo).where(Articulo.filtro_busqueda(termino))
+            articulos = (await sesion.scalars(consulta)).all()
+    return jsonify(
+        termino=termino,
+        articulos=[articulo.serializar() for articulo in articulos]
+    )
+
+
+@lectura_bp.route('/articulos/<string:codigo_articulo>')
+@admision.limitar_async('lectura_async')
+async def articulo_detalle(codigo_articulo):
+    """
+    Ruta para obtener el detalle de un artículo.
+
+    :param codigo_articulo: Código único del artículo.
+    :return: JSON con el artículo o 404 si no existe.
+    """
+    async with db_async.sesion() as sesion:
+        articulo = await sesion.get(Articulo, codigo_articulo)
+    if articulo is None:
+        return _no_encontrado(f'Artículo {codigo_articulo} no encontrado')
+    return jsonify(articulo.serializar())
+
+
+@lectura_bp.route('/clientes/<string:codigo_cliente>')
+@admision.limitar_async('lectura_async')
+async def cliente_detalle(codigo_cliente):
+    """
+    Ruta para consultar un cliente por su código.
+
+    :param codigo_cliente: Código único del cliente.
+    :return: JSON con el cliente o 404 si no existe.
+    """
+    async with db_async.sesion() as sesion:
+        cliente = await sesion.get(Cliente, codigo_cliente)
+    if cliente is None:
+        return _no_encontrado(f'Cliente {codigo_cliente} no encontrado')
+    return jsonify(cliente.serializar())
+
+
+@lectura_bp.route('/pedidos')
+@admision.limitar_async('lectura_async')
+async def pedidos_lista():
+    """
+    Ruta para obtener la lista de pedidos.
+
+    Parámetros de consulta:
+        cliente (str): Código de cliente para filtrar sus pedidos (opcional).
+
+    :return: JSON con la lista de pedidos.
+    """
+    consulta = select(Pedido).order_by(Pedido.id_pedido)
+    codigo_cliente = request.args.get('cliente')
+    if codigo_cliente:
+        consulta = consulta.where(Pedido.codigoCliente == codigo_cliente)
+    async with db_async.sesion() as sesion:
+        pedidos = (await sesion.scalars(consulta)).all()
+    return jsonify(pedidos=[pedido.serializar() for pedido in pedidos])
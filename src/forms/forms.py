@@ -2,15 +2,15 @@
 Módulo de formularios para la gestión de artículos en la aplicación Flask.
 
 Contiene clases de formularios basadas en Flask-WTF y WTForms para buscar,
-editar y agregar artículos al inventario.
+editar y agregar artículos al inventario, y para crear pedidos multilínea.
 
 Autor: Francisco Diaz Guiza 
 Fecha: 04/2025
 """
 
 from flask_wtf import FlaskForm
-from wtforms import StringField, FloatField, IntegerField, SubmitField
-from wtforms.validators import DataRequired, Length
+from wtforms import StringField, FloatField, IntegerField, SubmitField, TextAreaField
+from wtforms.validators import DataRequired, Length, ValidationError
 from wtforms.fields import DateField
 
 class BuscarArticuloForm(FlaskForm):
@@ -106,3 +106,51 @@ class AgregarArticuloForm(FlaskForm):
         validators=[DataRequired()]
     )  # Uso del formato YYYY-MM-DD
     submit = SubmitField('Agregar Artículo')
+
+
+class CarritoPedidoForm(FlaskForm):
+    """
+    Formulario para crear un pedido con varias líneas (carrito).
+
+    Las líneas se introducen una por fila con el formato "codigo cantidad"
+    (también se acepta "codigo,cantidad" o solo "codigo" para una unidad).
+
+    Atributos:
+        codigoCliente (StringField): Código del cliente que realiza el pedido.
+        lineas (TextAreaField): Líneas del pedido, una por fila.
+        submit (SubmitField): Botón para crear el pedido.
+        lineas_parseadas (list): Tuplas (codigo_articulo, cantidad) tras validar.
+    """
+    codigoCliente = StringField(
+        'Código Cliente',
+        validators=[DataRequired(), Length(min=1, max=10)]
+    )
+    lineas = TextAreaField(
+        'Líneas del pedido',
+        validators=[DataRequired()]
+    )
+    submit = SubmitField('Crear Pedido')
+
+    def validate_lineas(self, field):
+        """
+        Valida el formato de las líneas y las guarda en `lineas_parseadas`.
+
+        :param field: Campo con el texto de las líneas.
+        :raises ValidationError: Si alguna línea no tiene un formato válido.
+        """
+        self.lineas_parseadas = []
+        for numero, linea in enumerate(field.data.splitlines(), start=1):
+            partes = linea.replace(',', ' ').split()
+            if not partes:
+                continue
+            if len(partes) > 2 or len(partes[0]) > 10:
+                raise ValidationError(f'Línea {numero} no válida: "{linea.strip()}"')
+            try:
+                cantidad = int(partes[1]) if len(partes) == 2 else 1
+            except ValueError:
+                raise ValidationError(f'Cantidad no válida en la línea {numero}')
+            if cantidad < 1:
+                raise ValidationError(f'La cantidad debe ser mayor que 0 en la línea {numero}')
+            self.lineas_parseadas.append((partes[0], cantidad))
+        if not self.lineas_parseadas:
+            raise ValidationError('El pedido debe tener al menos una línea')
@@ -0,0 +1,541 @@
+"""
+Control de admisión y limitación de peticiones para rutas costosas.
+
+Este módulo protege el pool de conexiones de la base de datos frente a
+clientes que lanzan muchas peticiones pesadas (búsquedas con escaneo
+completo, listados sin paginar). Combina dos mecanismos por clase de ruta:
+
+- Un token bucket por cliente (IP) que limita la tasa sostenida y la ráfaga.
+- Un límite de peticiones pesadas simultáneas en curso.
+
+Cuando una petición no es admitida se responde de inmediato con 429 (tasa
+excedida) o 503 (capacidad saturada) y la cabecera Retry-After, en lugar de
+dejarla esperando. Las peticiones rechazadas se contabilizan.
+
+El estado se guarda en un backend intercambiable: `BackendMemoria` lo mantiene
+en el propio proceso y `BackendSQLite` lo comparte entre los workers de una
+misma máquina mediante un fichero SQLite local.
+
+Las rutas síncronas (Flask) se protegen con `limitar` y las de la API de
+lectura asíncrona (Quart) con `limitar_async`; ambos decoradores aplican la
+misma lógica sobre el mismo backend.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import wraps
+
+from flask import current_app, request
+
+# Cada cuántos segundos se descartan los token buckets inactivos
+INTERVALO_LIMPIEZA = 30
+
+
+class BackendMemoria:
+    """
+    Backend de estado en memoria, válido para un único proceso.
+
+    Guarda los token buckets, las peticiones en curso por clase y los
+    contadores de peticiones rechazadas, protegidos por un lock. Los buckets
+    que llevan inactivos lo suficiente para volver a estar llenos se
+    descartan periódicamente, de modo que la memoria no crece con cada IP
+    distinta que haya pasado por el servidor.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._en_curso = {}
+        self._contadores = {}
+        self._siguiente_ticket = 0
+        self._proxima_limpieza = time.monotonic() + INTERVALO_LIMPIEZA
+
+    # Operaciones en memoria: pueden llamarse directamente desde el bucle de eventos
+    bloqueante = False
+
+    def consumir_token(self, clave, tasa, rafaga):
+        """
+        Intenta consumir un token del bucket asociado a `clave`.
+
+        :param clave: Identificador del bucket (clase de ruta y cliente).
+        :param tasa: Tokens repuestos por segundo.
+        :param rafaga: Capacidad máxima del bucket.
+        :return: Tupla (admitida, segundos de espera recomendados).
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            if ahora >= self._proxima_limpieza:
+                self._limpiar_buckets(ahora)
+            tokens, ultimo, _ = self._buckets.get(clave, (rafaga, ahora, ahora))
+            tokens = min(rafaga, tokens + (ahora - ultimo) * tasa)
+            admitida = tokens >= 1
+            if admitida:
+                tokens -= 1
+            # Tercer elemento: instante a partir del cual el bucket estaría lleno y sobra
+            self._buckets[clave] = (tokens, ahora, ahora + (rafaga - tokens) / tasa)
+            return admitida, 0 if admitida else (1 - tokens) / tasa
+
+    def _limpiar_buckets(self, ahora):
+        """
+        Descarta los buckets que ya se habrían rellenado por completo.
+
+        Debe llamarse con el lock adquirido.
+
+        :param ahora: Instante actual (time.monotonic()).
+        """
+        self._buckets = {
+            clave: bucket for clave, bucket in self._buckets.items() if bucket[2] > ahora
+        }
+        self._proxima_limpieza = ahora + INTERVALO_LIMPIEZA
+
+    def adquirir(self, clase, limite, duracion_maxima):
+        """
+        Reserva un hueco de ejecución para la clase si no se ha alcanzado el límite.
+
+        En memoria los huecos desaparecen con el proceso, por lo que
+        `duracion_maxima` no se necesita; se acepta por compatibilidad con
+        los backends compartidos.
+
+        :param clase: Clase de ruta.
+        :param limite: Número máximo de peticiones simultáneas.
+        :param duracion_maxima: Segundos tras los que un hueco se considera abandonado.
+        :return: Ticket del hueco reservado o None si no hay hueco libre.
+        """
+        with self._lock:
+            en_curso = self._en_curso.get(clase, 0)
+            if en_curso >= limite:
+                return None
+            self._en_curso[clase] = en_curso + 1
+            self._siguiente_ticket += 1
+            return self._siguiente_ticket
+
+    def liberar(self, clase, ticket):
+        """
+        Libera un hueco de ejecución reservado con `adquirir`.
+
+        :param clase: Clase de ruta.
+        :param ticket: Ticket devuelto por `adquirir`.
+        """
+        with self._lock:
+            self._en_curso[clase] = max(self._en_curso.get(clase, 0) - 1, 0)
+
+    def incrementar(self, contador):
+        """
+        Incrementa en uno un contador de peticiones rechazadas.
+
+        :param contador: Nombre del contador.
+        """
+        with self._lock:
+            self._contadores[contador] = self._contadores.get(contador, 0) + 1
+
+    def contadores(self):
+        """
+        Devuelve una copia de los contadores y de las peticiones en curso.
+
+        :return: Diccionario con 'rechazadas', 'en_curso' y 'buckets'.
+        """
+        with self._lock:
+            return {
+                'rechazadas': dict(self._contadores),
+                'en_curso': dict(self._en_curso),
+                'buckets': len(self._buckets),
+            }
+
+
+class BackendSQLite:
+    """
+    Backend de estado compartido entre procesos mediante un fichero SQLite.
+
+    Pensado como sustituto local de un almacén compartido (por ejemplo, varios
+    workers de gunicorn en la misma máquina). Cada operación se ejecuta en una
+    transacción `BEGIN IMMEDIATE`, que serializa las escrituras entre procesos.
+
+    Cada petición en curso es una fila con el pid del worker y una fecha de
+    expiración. Si un worker muere a mitad de petición (SIGKILL, OOM, timeout
+    de gunicorn) y no llega a liberar su hueco, la fila se descarta en cuanto
+    su proceso deja de existir o expira, y el hueco vuelve a estar disponible.
+    """
+
+    # Versión del esquema del fichero (PRAGMA user_version)
+    VERSION_ESQUEMA = 2
+
+    # Las operaciones pueden esperar al bloqueo del fichero: fuera del bucle de eventos
+    bloqueante = True
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._proxima_limpieza = 0
+        self._transaccion(self._crear_esquema)
+        self._transaccion(lambda conexion: self._recoger_huecos(conexion, time.time()))
+
+    def _crear_esquema(self, conexion):
+        """
+        Crea las tablas o las recrea si el fichero es de otra versión del esquema.
+
+        El estado de admisión es efímero, así que no se migra: se descarta.
+
+        :param conexion: Conexión dentro de una transacción de escritura.
+        """
+        if conexion.execute('PRAGMA user_version').fetchone()[0] == self.VERSION_ESQUEMA:
+            return
+        for sentencia in (
+            'DROP TABLE IF EXISTS buckets',
+            'DROP TABLE IF EXISTS en_curso',
+            'CREATE TABLE buckets (clave TEXT PRIMARY KEY, tokens REAL NOT NULL, '
+            'ultimo REAL NOT NULL, expira REAL NOT NULL)',
+            'CREATE TABLE en_curso (ticket TEXT PRIMARY KEY, clase TEXT NOT NULL, '
+            'pid INTEGER NOT NULL, expira REAL NOT NULL)',
+            'CREATE INDEX ix_en_curso_clase ON en_curso (clase)',
+            'CREATE TABLE IF NOT EXISTS contadores (nombre TEXT PRIMARY KEY, total INTEGER NOT NULL)',
+            f'PRAGMA user_version = {self.VERSION_ESQUEMA}',
+        ):
+            conexion.execute(sentencia)
+
+    def _conexion(self):
+        """
+        Devuelve la conexión SQLite del hilo actual, creándola si no existe.
+
+        :return: Conexión sqlite3 en modo autocommit.
+        """
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            self._local.conexion = conexion
+        return conexion
+
+    def _transaccion(self, operacion):
+        """
+        Ejecuta `operacion(conexion)` dentro de una transacción exclusiva de escritura.
+
+        :param operacion: Función que recibe la conexión y devuelve un resultado.
+        :return: El resultado de `operacion`.
+        """
+        conexion = self._conexion()
+        conexion.execute('BEGIN IMMEDIATE')
+        try:
+            resultado = operacion(conexion)
+            conexion.execute('COMMIT')
+            return resultado
+        except Exception:
+            conexion.execute('ROLLBACK')
+            raise
+
+    def consumir_token(self, clave, tasa, rafaga):
+        """
+        Intenta consumir un token del bucket asociado a `clave`.
+
+        :param clave: Identificador del bucket (clase de ruta y cliente).
+        :param tasa: Tokens repuestos por segundo.
+        :param rafaga: Capacidad máxima del bucket.
+        :return: Tupla (admitida, segundos de espera recomendados).
+        """
+        # time.time() en lugar de monotonic(): el reloj debe ser común a todos los procesos
+        ahora = time.time()
+
+        def operacion(conexion):
+            if ahora >= self._proxima_limpieza:
+                # Buckets que ya estarían llenos: se recrean igual en la siguiente petición
+                conexion.execute('DELETE FROM buckets WHERE expira <= ?', (ahora,))
+                self._proxima_limpieza = ahora + INTERVALO_LIMPIEZA
+            fila = conexion.execute(
+                'SELECT tokens, ultimo FROM buckets WHERE clave = ?', (clave,)
+            ).fetchone()
+            tokens, ultimo = fila if fila else (rafaga, ahora)
+            tokens = min(rafaga, tokens + max(ahora - ultimo, 0) * tasa)
+            admitida = tokens >= 1
+            if admitida:
+                tokens -= 1
+            conexion.execute(
+                'INSERT OR REPLACE INTO buckets (clave, tokens, ultimo, expira) '
+                'VALUES (?, ?, ?, ?)',
+                (clave, tokens, ahora, ahora + (rafaga - tokens) / tasa)
+            )
+            return admitida, 0 if admitida else (1 - tokens) / tasa
+
+        return self._transaccion(operacion)
+
+    def _recoger_huecos(self, conexion, ahora):
+        """
+        Borra los huecos expirados o cuyo worker ya no existe.
+
+        :param conexion: Conexión dentro de una transacción de escritura.
+        :param ahora: Instante actual (time.time()).
+        """
+        conexion.execute('DELETE FROM en_curso WHERE expira <= ?', (ahora,))
+        pids = [fila[0] for fila in conexion.execute('SELECT DISTINCT pid FROM en_curso')]
+        muertos = [pid for pid in pids if pid != os.getpid() and not _proceso_vivo(pid)]
+        conexion.executemany('DELETE FROM en_curso WHERE pid = ?', [(pid,) for pid in muertos])
+
+    def adquirir(self, clase, limite, duracion_maxima):
+        """
+        Reserva un hueco de ejecución para la clase si no se ha alcanzado el límite.
+
+        Antes de contar los huecos ocupados recoge los abandonados por workers
+        muertos o que han superado `duracion_maxima`.
+
+        :param clase: Clase de ruta.
+        :param limite: Número máximo de peticiones simultáneas.
+        :param duracion_maxima: Segundos tras los que un hueco se considera abandonado.
+        :return: Ticket del hueco reservado o None si no hay hueco libre.
+        """
+        ahora = time.time()
+
+        def operacion(conexion):
+            ocupados = conexion.execute(
+                'SELECT COUNT(*) FROM en_curso WHERE clase = ?', (clase,)
+            ).fetchone()[0]
+            if ocupados >= limite:
+                self._recoger_huecos(conexion, ahora)
+                ocupados = conexion.execute(
+                    'SELECT COUNT(*) FROM en_curso WHERE clase = ?', (clase,)
+                ).fetchone()[0]
+                if ocupados >= limite:
+                    return None
+            ticket = uuid.uuid4().hex
+            conexion.execute(
+                'INSERT INTO en_curso (ticket, clase, pid, expira) VALUES (?, ?, ?, ?)',
+                (ticket, clase, os.getpid(), ahora + duracion_maxima)
+            )
+            return ticket
+
+        return self._transaccion(operacion)
+
+    def liberar(self, clase, ticket):
+        """
+        Libera un hueco de ejecución reservado con `adquirir`.
+
+        :param clase: Clase de ruta.
+        :param ticket: Ticket devuelto por `adquirir`.
+        """
+        self._transaccion(lambda conexion: conexion.execute(
+            'DELETE FROM en_curso WHERE ticket = ?', (ticket,)
+        ))
+
+    def incrementar(self, contador):
+        """
+        Incrementa en uno un contador de peticiones rechazadas.
+
+        :param contador: Nombre del contador.
+        """
+        self._transaccion(lambda conexion: conexion.execute(
+            'INSERT INTO contadores (nombre, total) VALUES (?, 1) '
+            'ON CONFLICT(nombre) DO UPDATE SET total = total + 1',
+            (contador,)
+        ))
+
+    def contadores(self):
+        """
+        Devuelve los contadores y las peticiones en curso de todos los procesos.
+
+        :return: Diccionario con 'rechazadas', 'en_curso' y 'buckets'.
+        """
+        conexion = self._conexion()
+        return {
+            'rechazadas': dict(conexion.execute('SELECT nombre, total FROM contadores')),
+            'en_curso': dict(conexion.execute(
+                'SELECT clase, COUNT(*) FROM en_curso WHERE expira > ? GROUP BY clase',
+                (time.time(),)
+            )),
+            'buckets': conexion.execute('SELECT COUNT(*) FROM buckets').fetchone()[0],
+        }
+
+
+def _proceso_vivo(pid):
+    """
+    Comprueba si existe un proceso con el pid dado en esta máquina.
+
+    :param pid: Identificador del proceso.
+    :return: True si el proceso existe (aunque pertenezca a otro usuario).
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ControlAdmision:
+    """
+    Extensión de Flask que aplica el control de admisión a las rutas marcadas.
+
+    Se inicializa con `init_app(app)` como el resto de extensiones y las rutas
+    se protegen con el decorador `limitar(clase)`. Los límites de cada clase se
+    leen de `ADMISION_CLASES` en la configuración de la aplicación.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Crea el backend de estado según la configuración y registra la extensión.
+
+        :param app: Instancia de la aplicación Flask.
+        :raises ValueError: Si `ADMISION_BACKEND` no es un backend conocido o los
+                            límites de alguna clase no son válidos.
+        """
+        for clase, limites in app.config.get('ADMISION_CLASES', {}).items():
+            if not limites['tasa'] > 0:
+                raise ValueError(f"ADMISION_CLASES['{clase}']: la tasa debe ser mayor que 0")
+            if not limites['rafaga'] >= 1:
+                raise ValueError(f"ADMISION_CLASES['{clase}']: la ráfaga debe ser al menos 1")
+            if not limites['concurrencia'] >= 1:
+                raise ValueError(f"ADMISION_CLASES['{clase}']: la concurrencia debe ser al menos 1")
+        tipo = app.config.get('ADMISION_BACKEND', 'memoria')
+        if tipo == 'memoria':
+            self.backend = BackendMemoria()
+        elif tipo == 'sqlite':
+            self.backend = BackendSQLite(app.config['ADMISION_SQLITE_RUTA'])
+        else:
+            raise ValueError(f'Backend de admisión desconocido: {tipo}')
+        app.extensions['admision'] = self
+
+    def _admitir(self, config, clase, cliente):
+        """
+        Aplica el token bucket del cliente y el límite de concurrencia de la clase.
+
+        Recibe la configuración en lugar de leer `current_app` para poder
+        ejecutarse fuera del contexto de la aplicación (en un hilo, desde Quart).
+
+        :param config: Configuración de la aplicación.
+        :param clase: Clave de la clase de ruta en `ADMISION_CLASES`.
+        :param cliente: Identificador del cliente (IP).
+        :return: Tupla (ticket del hueco reservado o None, respuesta de rechazo o None).
+        """
+        limites = config['ADMISION_CLASES'][clase]
+        admitida, espera = self.backend.consumir_token(
+            f'{clase}:{cliente}', limites['tasa'], limites['rafaga']
+        )
+        if not admitida:
+            self.backend.incrementar(f'{clase}:429')
+            return None, self._rechazo(429, 'Demasiadas peticiones', espera)
+
+        ticket = self.backend.adquirir(
+            clase, limites['concurrencia'], limites.get('duracion_maxima', 60)
+        )
+        if ticket is None:
+            self.backend.incrementar(f'{clase}:503')
+            return None, self._rechazo(503, 'Servicio saturado', limites.get('reintento', 1))
+        return ticket, None
+
+    @staticmethod
+    def _clave_cliente(config, peticion):
+        """
+        Identifica al cliente de la petición para su token bucket.
+
+        Detrás de un proxy inverso todas las peticiones llegan desde la IP del
+        proxy. Con `ADMISION_PROXIES` = N (saltos de proxy de confianza) se toma
+        la IP que añadió el proxy más externo en `X-Forwarded-For`, ignorando lo
+        que el propio cliente haya puesto antes en la cabecera.
+
+        :param config: Configuración de la aplicación.
+        :param peticion: Petición actual (Flask o Quart).
+        :return: Cadena que identifica al cliente.
+        """
+        proxies = config.get('ADMISION_PROXIES', 0)
+        if proxies > 0:
+            reenviadas = [
+                ip.strip() for ip in peticion.headers.get('X-Forwarded-For', '').split(',')
+                if ip.strip()
+            ]
+            if len(reenviadas) >= proxies:
+                return reenviadas[-proxies]
+        return peticion.remote_addr or 'desconocido'
+
+    def limitar(self, clase):
+        """
+        Decorador que somete una ruta al control de admisión de una clase.
+
+        :param clase: Clave de la clase de ruta en `ADMISION_CLASES` (p. ej. 'pesada').
+        :return: Decorador para la función de vista.
+        """
+        def decorador(vista):
+            @wraps(vista)
+            def envoltura(*args, **kwargs):
+                if not current_app.config.get('ADMISION_HABILITADA', True):
+                    return vista(*args, **kwargs)
+
+                ticket, rechazo = self._admitir(
+                    current_app.config, clase, self._clave_cliente(current_app.config, request)
+                )
+                if rechazo is not None:
+                    return rechazo
+                try:
+                    return vista(*args, **kwargs)
+                finally:
+                    self.backend.liberar(clase, ticket)
+            return envoltura
+        return decorador
+
+    def limitar_async(self, clase):
+        """
+        Variante de `limitar` para las vistas asíncronas de la aplicación Quart.
+
+        Comparte el backend con `limitar`. Con un backend bloqueante (SQLite)
+        las operaciones se ejecutan en un hilo para no detener el bucle de eventos.
+
+        :param clase: Clave de la clase de ruta en `ADMISION_CLASES` (p. ej. 'lectura_async').
+        :return: Decorador para la función de vista asíncrona.
+        """
+        from quart import current_app as app_actual, request as peticion
+
+        def decorador(vista):
+            @wraps(vista)
+            async def envoltura(*args, **kwargs):
+                if not app_actual.config.get('ADMISION_HABILITADA', True):
+                    return await vista(*args, **kwargs)
+
+                cliente = self._clave_cliente(app_actual.config, peticion)
+                if self.backend.bloqueante:
+                    ticket, rechazo = await asyncio.to_thread(
+                        self._admitir, app_actual.config, clase, cliente
+                    )
+                else:
+                    ticket, rechazo = self._admitir(app_actual.config, clase, cliente)
+                if rechazo is not None:
+                    return rechazo
+                try:
+                    return await vista(*args, **kwargs)
+                finally:
+                    if self.backend.bloqueante:
+                        await asyncio.to_thread(self.backend.liberar, clase, ticket)
+                    else:
+                        self.backend.liberar(clase, ticket)
+            return envoltura
+        return decorador
+
+    def contadores(self):
+        """
+        Devuelve los contadores de peticiones rechazadas y en curso.
+
+        :return: Diccionario con 'rechazadas' y 'en_curso'.
+        """
+        return self.backend.contadores()
+
+    @staticmethod
+    def _rechazo(codigo, mensaje, espera):
+        """
+        Construye la respuesta rápida de rechazo con la cabecera Retry-After.
+
+        :param codigo: Código HTTP (429 o 503).
+        :param mensaje: Descripción del motivo del rechazo.
+        :param espera: Segundos recomendados antes de reintentar.
+        :return: Tupla (cuerpo JSON, código, cabeceras).
+        """
+        segundos = max(int(math.ceil(espera)), 1)
+        # Tupla (cuerpo, código, cabeceras): válida tanto en Flask como en Quart
+        return {'error': mensaje, 'reintentar_en': segundos}, codigo, {'Retry-After': str(segundos)}
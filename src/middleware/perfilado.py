@@ -0,0 +1,368 @@
+"""
+Perfilado bajo demanda de peticiones HTTP.
+
+Este módulo permite ver por qué una ruta es lenta en producción sin volver a
+desplegar. Una petición se perfila cuando incluye la cabecera de perfilado
+con el token autorizado o cuando cae dentro de la tasa de muestreo
+configurada. Para cada petición perfilada se captura:
+
+- Un perfil de CPU con cProfile (resumen de funciones y fichero .prof completo).
+- Las sentencias SQL ejecutadas con su duración. Los valores de los
+  parámetros (datos de clientes) solo se guardan si se activa
+  `PERFILADO_GUARDAR_PARAMETROS`.
+
+Los resultados se guardan en un directorio que actúa como anillo acotado:
+al superar el máximo se borran los perfiles más antiguos. Si el perfilado
+está desactivado (sin token ni muestreo) no se registra ningún hook, por lo
+que no añade coste alguno a las peticiones.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import cProfile
+import contextvars
+import hmac
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Captura en curso de la petición actual (None si no se está perfilando)
+_captura_actual = contextvars.ContextVar('captura_perfilado', default=None)
+
+# Identificadores de perfil válidos (evita rutas arbitrarias en el directorio)
+PATRON_ID_PERFIL = re.compile(r'^[0-9T]{21}_[0-9a-f]{8}$')
+
+MAX_FUNCIONES = 40  # Funciones guardadas en el resumen de CPU
+MAX_SENTENCIAS = 500  # Sentencias SQL guardadas por perfil
+MAX_LONGITUD_SQL = 2000  # Caracteres guardados de cada sentencia
+
+
+class _Captura:
+    """
+    Estado de una petición que se está perfilando.
+    """
+
+    def __init__(self, guardar_parametros=False):
+        self.guardar_parametros = guardar_parametros
+        self.perfil = cProfile.Profile()
+        self.sentencias = []
+        self.total_sentencias = 0
+        self.inicio = time.perf_counter()
+
+
+class Perfilador:
+    """
+    Extensión de Flask que perfila peticiones bajo demanda y guarda los resultados.
+
+    Se inicializa con `init_app(app)` como el resto de extensiones. La
+    configuración se lee de las claves `PERFILADO_*` de la aplicación.
+    """
+
+    def __init__(self, app=None):
+        self.token = None
+        self.cabecera = 'X-Perfilar'
+        self.tasa = 0
+        self.directorio = None
+        self.maximo = 100
+        self.guardar_parametros = False
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def habilitado(self):
+        """
+        :return: True si hay algún modo de activar el perfilado.
+        """
+        return bool(self.token) or self.tasa > 0
+
+    def init_app(self, app):
+        """
+        Lee la configuración y, solo si el perfilado está habilitado, registra los hooks.
+
+        Avisa si hay muestreo sin token: los perfiles se guardarían en disco
+        pero la página de administración no sería accesible.
+
+        :param app: Instancia de la aplicación Flask.
+        """
+        self.token = app.config.get('PERFILADO_TOKEN')
+        self.cabecera = app.config.get('PERFILADO_CABECERA', 'X-Perfilar')
+        self.tasa = app.config.get('PERFILADO_TASA', 0)
+        self.directorio = app.config.get('PERFILADO_DIR', 'perfiles')
+        self.maximo = app.config.get('PERFILADO_MAX', 100)
+        self.guardar_parametros = app.config.get('PERFILADO_GUARDAR_PARAMETROS', False)
+        app.extensions['perfilador'] = self
+
+        if not self.habilitado:
+            return
+        if not self.token:
+            logging.warning(
+                "PERFILADO_TASA > 0 sin PERFILADO_TOKEN: los perfiles muestreados se guardan "
+                f"en '{self.directorio}' pero /admin/perfiles/ no estará disponible"
+            )
+        app.before_request(self._iniciar)
+        app.after_request(self._finalizar_respuesta)
+        app.teardown_request(self._finalizar_error)
+        if not event.contains(Engine, 'before_cursor_execute', _antes_sentencia):
+            event.listen(Engine, 'before_cursor_execute', _antes_sentencia)
+            event.listen(Engine, 'after_cursor_execute', _despues_sentencia)
+
+    def token_valido(self, valor):
+        """
+        Comprueba un token de perfilado en tiempo constante.
+
+        Compara bytes UTF-8: `hmac.compare_digest` lanza TypeError con cadenas
+        que no son ASCII, y el token llega de una cabecera o parámetro del cliente.
+
+        :param valor: Token recibido.
+        :return: True si coincide con el token configurado.
+        """
+        if not self.token or not valor or not isinstance(valor, str):
+            return False
+        return hmac.compare_digest(
+            valor.encode('utf-8', 'surrogateescape'), self.token.encode('utf-8', 'surrogateescape')
+        )
+
+    def _debe_perfilar(self):
+        """
+        Decide si la petición actual se perfila (cabecera autorizada o muestreo).
+
+        :return: True si debe perfilarse.
+        """
+        if request.blueprint == 'perfiles' or request.endpoint in (None, 'static'):
+            return False
+        if self.token_valido(request.headers.get(self.cabecera)):
+            return True
+        return self.tasa > 0 and random.random() < self.tasa
+
+    def _iniciar(self):
+        """
+        Hook before_request: arranca el perfil de CPU si la petición debe perfilarse.
+        """
+        if not self._debe_perfilar():
+            return
+        captura = _Captura(self.guardar_parametros)
+        try:
+            captura.perfil.enable()
+        except ValueError:
+            # Otro perfilador activo en este hilo; se omite esta petición
+            return
+        _captura_actual.set(captura)
+
+    def _finalizar_respuesta(self, response):
+        """
+        Hook after_request: guarda el perfil y añade su identificador a la respuesta.
+
+        :param response: Respuesta de Flask.
+        :return: La misma respuesta, con la cabecera `X-Perfil-Id` si se perfiló.
+        """
+        id_perfil = self._finalizar(response.status_code)
+        if id_perfil:
+            response.headers['X-Perfil-Id'] = id_perfil
+        return response
+
+    def _finalizar_error(self, error):
+        """
+        Hook teardown_request: guarda el perfil si la petición terminó sin respuesta.
+
+        :param error: Excepción no controlada, si la hubo.
+        """
+        if error is not None:
+            self._finalizar(500)
+
+    def _finalizar(self, estado):
+        """
+        Detiene la captura en curso y la guarda en disco.
+
+        :param estado: Código HTTP de la respuesta.
+        :return: Identificador del perfil guardado o None.
+        """
+        captura = _captura_actual.get()
+        if captura is None:
+            return None
+        captura.perfil.disable()
+        _captura_actual.set(None)
+        duracion = time.perf_counter() - captura.inicio
+        try:
+            return self._guardar(captura, estado, duracion)
+        except OSError as e:
+            logging.error(f"Error al guardar el perfil de {request.path}: {e}")
+            return None
+
+    def _guardar(self, captura, estado, duracion):
+        """
+        Escribe el resumen JSON y el fichero .prof, y recorta el anillo.
+
+        :return: Identificador del perfil guardado.
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        ahora = datetime.now()
+        id_perfil = f"{ahora:%Y%m%dT%H%M%S%f}_{uuid.uuid4().hex[:8]}"
+        base = os.path.join(self.directorio, id_perfil)
+
+        captura.perfil.dump_stats(base + '.prof')
+        resumen = {
+            'id': id_perfil,
+            'fecha': ahora.isoformat(timespec='seconds'),
+            'metodo': request.method,
+            'ruta': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'estado': estado,
+            'duracion_ms': round(duracion * 1000, 2),
+            'sql_total': captura.total_sentencias,
+            'sql_ms': round(sum(s['duracion_ms'] for s in captura.sentencias), 2),
+            'funciones': _resumen_funciones(captura.perfil),
+            'consultas': _resumen_consultas(captura.sentencias),
+            'sentencias': captura.sentencias,
+        }
+        temporal = base + '.json.tmp'
+        with open(temporal, 'w', encoding='utf-8') as fichero:
+            json.dump(resumen, fichero, ensure_ascii=False)
+        os.replace(temporal, base + '.json')
+        self._recortar()
+        return id_perfil
+
+    def _ids(self):
+        """
+        :return: Identificadores de los perfiles guardados, del más antiguo al más reciente.
+        """
+        if not os.path.isdir(self.directorio):
+            return []
+        return sorted(
+            nombre[:-5] for nombre in os.listdir(self.directorio)
+            if nombre.endswith('.json') and PATRON_ID_PERFIL.match(nombre[:-5])
+        )
+
+    def _recortar(self):
+        """
+        Borra los perfiles más antiguos por encima de `PERFILADO_MAX`.
+        """
+        ids = self._ids()
+        for id_perfil in ids[:max(len(ids) - self.maximo, 0)]:
+            for extension in ('.json', '.prof'):
+                try:
+                    os.remove(os.path.join(self.directorio, id_perfil + extension))
+                except FileNotFoundError:
+                    pass
+
+    def listar(self):
+        """
+        Devuelve los metadatos de los perfiles guardados, del más reciente al más antiguo.
+
+        :return: Lista de diccionarios sin el detalle de funciones ni sentencias.
+        """
+        perfiles = []
+        for id_perfil in reversed(self._ids()):
+            perfil = self.cargar(id_perfil)
+            if perfil is None:
+                continue
+            for clave in ('funciones', 'consultas', 'sentencias'):
+                perfil.pop(clave, None)
+            perfiles.append(perfil)
+        return perfiles
+
+    def cargar(self, id_perfil):
+        """
+        Carga el resumen completo de un perfil.
+
+        :param id_perfil: Identificador del perfil.
+        :return: Diccionario del perfil o None si no existe o no es válido.
+        """
+        ruta = self.ruta_fichero(id_perfil, '.json')
+        if ruta is None:
+            return None
+        try:
+            with open(ruta, encoding='utf-8') as fichero:
+                return json.load(fichero)
+        except (OSError, ValueError):
+            return None
+
+    def ruta_fichero(self, id_perfil, extension):
+        """
+        Construye la ruta de un fichero de perfil validando el identificador.
+
+        :param id_perfil: Identificador del perfil.
+        :param extension: '.json' o '.prof'.
+        :return: Ruta absoluta o None si el identificador no es válido.
+        """
+        if not PATRON_ID_PERFIL.match(id_perfil):
+            return None
+        return os.path.abspath(os.path.join(self.directorio, id_perfil + extension))
+
+
+def _antes_sentencia(conn, cursor, statement, parameters, context, executemany):
+    """
+    Listener before_cursor_execute: anota el inicio si la petición se está perfilando.
+    """
+    if _captura_actual.get() is not None:
+        conn.info.setdefault('perfilado_inicio', []).append(time.perf_counter())
+
+
+def _despues_sentencia(conn, cursor, statement, parameters, context, executemany):
+    """
+    Listener after_cursor_execute: registra la sentencia y su duración.
+    """
+    captura = _captura_actual.get()
+    inicios = conn.info.get('perfilado_inicio')
+    if captura is None or not inicios:
+        return
+    duracion = time.perf_counter() - inicios.pop()
+    captura.total_sentencias += 1
+    if len(captura.sentencias) < MAX_SENTENCIAS:
+        sentencia = {
+            'sql': statement[:MAX_LONGITUD_SQL],
+            'duracion_ms': round(duracion * 1000, 3),
+        }
+        if captura.guardar_parametros:
+            sentencia['parametros'] = repr(parameters)[:200]
+        captura.sentencias.append(sentencia)
+
+
+def _resumen_funciones(perfil):
+    """
+    Resume el perfil de CPU en las funciones con mayor tiempo acumulado.
+
+    :param perfil: Instancia de cProfile.Profile ya detenida.
+    :return: Lista de diccionarios ordenada por tiempo acumulado.
+    """
+    estadisticas = pstats.Stats(perfil).stats
+    filas = [
+        {
+            'funcion': nombre,
+            'ubicacion': f'{fichero}:{linea}',
+            'llamadas': llamadas,
+            'propio_ms': round(propio * 1000, 3),
+            'acumulado_ms': round(acumulado * 1000, 3),
+        }
+        for (fichero, linea, nombre), (_, llamadas, propio, acumulado, _) in estadisticas.items()
+    ]
+    filas.sort(key=lambda fila: fila['acumulado_ms'], reverse=True)
+    return filas[:MAX_FUNCIONES]
+
+
+def _resumen_consultas(sentencias):
+    """
+    Agrupa las sentencias SQL iguales y las ordena por tiempo total.
+
+    :param sentencias: Lista de sentencias capturadas.
+    :return: Lista de diccionarios con 'sql', 'veces' y 'total_ms'.
+    """
+    grupos = {}
+    for sentencia in sentencias:
+        grupo = grupos.setdefault(sentencia['sql'], {'sql': sentencia['sql'], 'veces': 0, 'total_ms': 0})
+        grupo['veces'] += 1
+        grupo['total_ms'] += sentencia['duracion_ms']
+    consultas = sorted(grupos.values(), key=lambda grupo: grupo['total_ms'], reverse=True)
+    for consulta in consultas:
+        consulta['total_ms'] = round(consulta['total_ms'], 3)
+    return consultas
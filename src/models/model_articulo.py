@@ -36,6 +36,44 @@ class Articulo(db.Model):
     pais_origen = db.Column(db.String(50), nullable=False)
     foto = db.Column(db.String(100), nullable=True)  # Campo opcional para la foto
 
+    @classmethod
+    def filtro_busqueda(cls, termino):
+        """
+        Construye la condición de búsqueda de un término en los campos relevantes.
+
+        Se comparte entre la ruta síncrona de búsqueda y la API de lectura
+        asíncrona para que ambas devuelvan los mismos resultados.
+
+        :param termino: Texto a buscar (coincidencia parcial, sin distinguir mayúsculas).
+        :return: Expresión SQLAlchemy utilizable en `filter` o `where`.
+        """
+        patron = f'%{termino}%'
+        return (
+            (cls.codigo_articulo.ilike(patron)) |
+            (cls.seccion.ilike(patron)) |
+            (cls.nombre_articulo.ilike(patron)) |
+            (cls.precio.ilike(patron)) |
+            (cls.importado.ilike(patron)) |
+            (cls.pais_origen.ilike(patron))
+        )
+
+    def serializar(self):
+        """
+        Devuelve los datos del artículo como un diccionario serializable a JSON.
+
+        :return: Diccionario con los campos del artículo (fecha en formato ISO).
+        """
+        return {
+            'codigo_articulo': self.codigo_articulo,
+            'seccion': self.seccion,
+            'nombre_articulo': self.nombre_articulo,
+            'precio': self.precio,
+            'fecha': self.fecha.isoformat() if self.fecha else None,
+            'importado': self.importado,
+            'pais_origen': self.pais_origen,
+            'foto': self.foto,
+        }
+
     def __repr__(self):
         """
         Representación legible del modelo Articulo para depuración.
@@ -0,0 +1,167 @@
+"""
+Modelo de datos para el registro de cambios (change feed) del catálogo.
+
+Cada escritura sobre artículos o clientes queda anotada en la tabla 'cambios'
+con una versión monótonamente creciente. Los terminales de venta usan esa
+versión como cursor para descargar solo lo que ha cambiado desde su última
+sincronización, en lugar del catálogo completo.
+
+Las eliminaciones se registran como lápidas (operación 'eliminar') para que
+los clientes puedan borrar su copia local.
+
+Las versiones no salen de un autoincremental (que se asigna al insertar, no
+al confirmar) sino de un contador de una sola fila que se incrementa con un
+UPDATE atómico dentro de la propia transacción de escritura. El UPDATE
+bloquea la fila hasta el final de la transacción, así que dos escrituras
+concurrentes obtienen sus versiones en el orden en que confirman y un lector
+nunca ve la versión N+1 sin haber podido ver la N.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DDL, event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from extensions import db  # Importa la extensión de SQLAlchemy inicializada en la app
+from src.models.model_articulo import Articulo
+from src.models.model_cliente import Cliente
+
+# Entidades sincronizables: clase del modelo -> (nombre de la entidad, atributo clave)
+ENTIDADES_SINCRONIZABLES = {
+    Articulo: ('articulo', 'codigo_articulo'),
+    Cliente: ('cliente', 'codigoCliente'),
+}
+
+OPERACION_GUARDAR = 'guardar'
+OPERACION_ELIMINAR = 'eliminar'
+
+
+class ContadorSync(db.Model):
+    """
+    Contador de una sola fila con la última versión asignada en el feed de cambios.
+
+    Atributos:
+        id (int): Identificador de la fila (siempre 1).
+        version (int): Última versión entregada a un cambio.
+    """
+    __tablename__ = 'contador_sync'  # Nombre de la tabla en la base de datos
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# La fila del contador se crea junto con la tabla; las escrituras solo la incrementan
+event.listen(
+    ContadorSync.__table__,
+    'after_create',
+    DDL('INSERT INTO contador_sync (id, version) VALUES (1, 0)'),
+)
+
+
+class Cambio(db.Model):
+    """
+    Modelo que representa un cambio sobre una entidad sincronizable.
+
+    Atributos:
+        version (int): Versión del cambio (clave primaria, asignada en orden de confirmación).
+        entidad (str): Tipo de entidad modificada ('articulo' o 'cliente').
+        clave (str): Clave primaria de la entidad modificada.
+        operacion (str): 'guardar' para altas/ediciones o 'eliminar' para lápidas.
+        fecha_cambio (datetime): Momento en que se registró el cambio.
+    """
+    __tablename__ = 'cambios'  # Nombre de la tabla en la base de datos
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    entidad = db.Column(db.String(20), nullable=False)
+    clave = db.Column(db.String(10), nullable=False)
+    operacion = db.Column(db.String(10), nullable=False)
+    fecha_cambio = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Índice compuesto para leer el feed de una entidad a partir de una versión
+    __table_args__ = (
+        db.Index('ix_cambios_entidad_version', 'entidad', 'version'),
+    )
+
+    def __repr__(self):
+        """
+        Representación legible del modelo Cambio para depuración.
+
+        :return: Cadena representando el cambio.
+        """
+        return (
+            f"<Cambio(version={self.version}, entidad='{self.entidad}', "
+            f"clave='{self.clave}', operacion='{self.operacion}')>"
+        )
+
+
+def reservar_versiones(conexion, cantidad):
+    """
+    Reserva `cantidad` versiones consecutivas del contador del feed.
+
+    Incrementa el contador con un único UPDATE atómico y lee el resultado en
+    la misma transacción. En MySQL el UPDATE bloquea la fila hasta el commit,
+    de modo que otra escritura concurrente espera a que esta confirme antes de
+    obtener las siguientes versiones. En SQLite el UPDATE abre la transacción y
+    toma el bloqueo de escritura de la base de datos, con el mismo resultado.
+
+    :param conexion: Conexión de la transacción de escritura.
+    :param cantidad: Número de versiones a reservar.
+    :return: Primera versión reservada.
+    :raises RuntimeError: Si la fila del contador no existe (ejecutar `flask sync inicializar`).
+    """
+    tabla = ContadorSync.__table__
+    resultado = conexion.execute(
+        update(tabla).where(tabla.c.id == 1).values(version=tabla.c.version + cantidad)
+    )
+    if resultado.rowcount != 1:
+        raise RuntimeError(
+            "Falta la fila del contador del feed de cambios: ejecuta 'flask sync inicializar'"
+        )
+    ultima = conexion.execute(select(tabla.c.version).where(tabla.c.id == 1)).scalar_one()
+    return ultima - cantidad + 1
+
+
+@event.listens_for(Session, 'before_flush')
+def registrar_cambios(session, flush_context, instances):
+    """
+    Estampa una versión por cada artículo o cliente creado, editado o eliminado.
+
+    Se ejecuta antes de cada flush, de modo que los registros de cambio se
+    insertan en la misma transacción que la escritura que los origina. Si se
+    modifica la clave primaria de una entidad, se registra una lápida para la
+    clave anterior y un guardado para la nueva.
+
+    :param session: Sesión de SQLAlchemy que va a hacer flush.
+    :param flush_context: Contexto interno del flush (no utilizado).
+    :param instances: Instancias pasadas explícitamente a flush (no utilizado).
+    """
+    pendientes = []
+    for objeto in session.new:
+        if type(objeto) in ENTIDADES_SINCRONIZABLES:
+            entidad, atributo = ENTIDADES_SINCRONIZABLES[type(objeto)]
+            pendientes.append((entidad, getattr(objeto, atributo), OPERACION_GUARDAR))
+
+    for objeto in session.dirty:
+        if type(objeto) not in ENTIDADES_SINCRONIZABLES:
+            continue
+        if not session.is_modified(objeto, include_collections=False):
+            continue
+        entidad, atributo = ENTIDADES_SINCRONIZABLES[type(objeto)]
+        historial = inspect(objeto).attrs[atributo].history
+        for clave_anterior in historial.deleted or ():
+            pendientes.append((entidad, clave_anterior, OPERACION_ELIMINAR))
+        pendientes.append((entidad, getattr(objeto, atributo), OPERACION_GUARDAR))
+
+    for objeto in session.deleted:
+        if type(objeto) in ENTIDADES_SINCRONIZABLES:
+            entidad, atributo = ENTIDADES_SINCRONIZABLES[type(objeto)]
+            pendientes.append((entidad, getattr(objeto, atributo), OPERACION_ELIMINAR))
+
+    if not pendientes:
+        return
+    primera = reservar_versiones(session.connection(), len(pendientes))
+    for version, (entidad, clave, operacion) in enumerate(pendientes, start=primera):
+        session.add(Cambio(version=version, entidad=entidad, clave=clave, operacion=operacion))
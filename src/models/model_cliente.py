@@ -34,6 +34,22 @@ class Cliente(db.Model):
     responsable = db.Column(db.String(100), nullable=True)
     historial = db.Column(db.String(255), nullable=True)
 
+    def serializar(self):
+        """
+        Devuelve los datos del cliente como un diccionario serializable a JSON.
+
+        :return: Diccionario con los campos del cliente.
+        """
+        return {
+            'codigoCliente': self.codigoCliente,
+            'empresa': self.empresa,
+            'direccion': self.direccion,
+            'poblacion': self.poblacion,
+            'telefono': self.telefono,
+            'responsable': self.responsable,
+            'historial': self.historial,
+        }
+
     def __repr__(self):
         """
         Representación legible del modelo Cliente para depuración.
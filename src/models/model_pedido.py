@@ -2,7 +2,8 @@
 Modelo de datos para los pedidos del sistema.
 
 Define la estructura de la tabla 'pedidos' en la base de datos y los campos
-que representan cada pedido, así como las relaciones con clientes y artículos.
+que representan cada línea de pedido, así como las relaciones con clientes y
+artículos. Las líneas de un mismo pedido multilínea comparten `numero_pedido`.
 
 Autor: Francisco Diaz Guiza
 Fecha: 04/2025
@@ -21,6 +22,8 @@ class Pedido(db.Model):
         codigo_articulo (str): Código del artículo solicitado (clave foránea).
         cantidad (int): Cantidad de artículos solicitados.
         fecha_pedido (date): Fecha en que se realizó el pedido.
+        numero_pedido (str): Identificador común a las líneas de un pedido multilínea (opcional).
+        precio_unitario (float): Precio del artículo en el momento del pedido (opcional).
         cliente (Cliente): Relación con el modelo Cliente.
         articulo (Articulo): Relación con el modelo Articulo.
     """
@@ -41,11 +44,29 @@ class Pedido(db.Model):
 
     cantidad = db.Column(db.Integer, nullable=False, default=1)
     fecha_pedido = db.Column(db.Date, nullable=False)
+    numero_pedido = db.Column(db.String(32), nullable=True, index=True)
+    precio_unitario = db.Column(db.Float, nullable=True)
 
     # Relaciones con otros modelos
     cliente = db.relationship('Cliente', backref='pedidos', lazy=True)
     articulo = db.relationship('Articulo', backref='pedidos', lazy=True)
 
+    def serializar(self):
+        """
+        Devuelve los datos del pedido como un diccionario serializable a JSON.
+
+        :return: Diccionario con los campos del pedido (fecha en formato ISO).
+        """
+        return {
+            'id_pedido': self.id_pedido,
+            'codigoCliente': self.codigoCliente,
+            'codigo_articulo': self.codigo_articulo,
+            'cantidad': self.cantidad,
+            'fecha_pedido': self.fecha_pedido.isoformat() if self.fecha_pedido else None,
+            'numero_pedido': self.numero_pedido,
+            'precio_unitario': self.precio_unitario,
+        }
+
     def __repr__(self):
         """
         Representación legible del modelo Pedido para depuración.
@@ -12,7 +12,7 @@ Fecha: 04/2025
 from flask import Blueprint, flash, render_template, url_for, request, redirect
 from src.models.model_articulo import Articulo
 from src.forms.forms import EditarArticuloForm
-from extensions import db
+from extensions import db, admision
 import logging
 
 # Definición del Blueprint para las rutas de artículos
@@ -20,6 +20,7 @@ articulos_bp = Blueprint('articulos', __name__, template_folder='templates')
 
 
 @articulos_bp.route('/articulos/')
+@admision.limitar('pesada')
 def articulos_lista():
     """
     Ruta para mostrar la lista de todos los artículos.
@@ -46,6 +47,7 @@ def articulos_lista():
 
 
 @articulos_bp.route('/buscar_articulo', methods=['GET', 'POST'])
+@admision.limitar('pesada')
 def buscar_articulo():
     """
     Ruta para buscar artículos en el inventario.
@@ -59,14 +61,7 @@ def buscar_articulo():
     termino = request.args.get('termino', '').strip()
     articulos = []
     if termino:
-        articulos = Articulo.query.filter(
-            (Articulo.codigo_articulo.ilike(f'%{termino}%')) |
-            (Articulo.seccion.ilike(f'%{termino}%')) |
-            (Articulo.nombre_articulo.ilike(f'%{termino}%')) |
-            (Articulo.precio.ilike(f'%{termino}%')) |
-            (Articulo.importado.ilike(f'%{termino}%')) |
-            (Articulo.pais_origen.ilike(f'%{termino}%'))
-        ).all()
+        articulos = Articulo.query.filter(Articulo.filtro_busqueda(termino)).all()
     return render_template('articulos.html', articulos=articulos, termino=termino)
 
 
@@ -10,12 +10,14 @@ Fecha: 04/2025
 
 from flask import Blueprint, render_template, url_for
 from src.models.model_cliente import Cliente
+from extensions import admision
 
 # Definición del Blueprint para las rutas de clientes
 clientes_bp = Blueprint('clientes', __name__, template_folder='templates')
 
 
 @clientes_bp.route('/clientes/')
+@admision.limitar('pesada')
 def clientes_lista():
     """
     Ruta para mostrar la lista de todos los clientes.
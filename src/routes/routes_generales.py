@@ -10,8 +10,9 @@ Fecha: 04/2025
 """
 
 import logging
-from flask import Blueprint, render_template, url_for
+from flask import Blueprint, jsonify, render_template, url_for
 from src.models.model_articulo import Articulo
+from extensions import admision
 
 # Definición del Blueprint para las rutas generales
 generales_bp = Blueprint('generales', __name__, template_folder='templates')
@@ -44,6 +45,20 @@ def index():
     )
 
 
+@generales_bp.route('/admision/contadores')
+def admision_contadores():
+    """
+    Ruta para consultar el estado del control de admisión.
+
+    Devuelve cuántas peticiones se han rechazado por clase y motivo
+    ('<clase>:429' por tasa excedida, '<clase>:503' por saturación) y cuántas
+    peticiones pesadas hay en curso.
+
+    :return: JSON con los contadores del control de admisión.
+    """
+    return jsonify(admision.contadores())
+
+
 @generales_bp.app_errorhandler(404)
 def pagina_no_encontrada(error):
     """
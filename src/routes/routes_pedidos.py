@@ -1,21 +1,41 @@
 """
 Rutas relacionadas con la gestión de pedidos en la aplicación Flask.
 
-Este módulo define las rutas para listar los pedidos registrados en el sistema.
+Este módulo define las rutas para listar los pedidos registrados en el sistema
+y para crear pedidos multilínea (carrito) en una única transacción.
 Utiliza Blueprints para modularizar la aplicación y facilitar el mantenimiento.
 
 Autor: Francisco Diaz Guiza
 Fecha: 04/2025
 """
 
-from flask import Blueprint, render_template, url_for
+import logging
+import uuid
+from datetime import date
+
+from flask import (
+    Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
+)
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+from src.models.model_articulo import Articulo
+from src.models.model_cliente import Cliente
 from src.models.model_pedido import Pedido
+from src.forms.forms import CarritoPedidoForm
+from extensions import db, admision
 
 # Definición del Blueprint para las rutas de pedidos
 pedidos_bp = Blueprint('pedidos', __name__, template_folder='templates')
 
+# Mayor cantidad por artículo que admite la columna INTEGER de la tabla pedidos
+CANTIDAD_MAXIMA = 2**31 - 1
+
+# Longitud máxima de los códigos de artículo y cliente (String(10) en los modelos)
+LONGITUD_MAXIMA_CODIGO = 10
+
 
 @pedidos_bp.route('/pedidos/')
+@admision.limitar('pesada')
 def pedidos_lista():
     """
     Ruta para mostrar la lista de todos los pedidos.
@@ -29,6 +49,7 @@ def pedidos_lista():
     pedidos_data = [
         {
             'id_pedido': pedido.id_pedido,
+            'numero_pedido': pedido.numero_pedido,
             'codigoCliente': pedido.codigoCliente,
             'codigo_articulo': pedido.codigo_articulo,
             'cantidad': pedido.cantidad,
@@ -36,4 +57,191 @@ def pedidos_lista():
         }
         for pedido in pedidos
     ]
-    return render_template('pedidos.html', pedidos=pedidos_data)
\ No newline at end of file
+    return render_template('pedidos.html', pedidos=pedidos_data)
+
+
+def crear_pedido_multilinea(codigo_cliente, lineas):
+    """
+    Crea todas las líneas de un pedido en una única transacción.
+
+    - Agrupa las líneas repetidas del mismo artículo sumando sus cantidades.
+    - Valida el cliente y todos los artículos, y obtiene sus precios, con una
+      sola consulta (UNION ALL de dos SELECT, uno de ellos con IN).
+    - Inserta todas las líneas con un único INSERT de varias filas.
+
+    :param codigo_cliente: Código del cliente que realiza el pedido.
+    :param lineas: Iterable de tuplas (codigo_articulo, cantidad).
+    :return: Diccionario con 'numero_pedido', 'lineas' y 'total'.
+    :raises ValueError: Si el pedido no es válido (cliente o artículos inexistentes,
+                        demasiadas líneas o cantidades no válidas).
+    """
+    cantidades = {}
+    for codigo_articulo, cantidad in lineas:
+        if int(cantidad) < 1:
+            raise ValueError(f'Cantidad no válida para el artículo {codigo_articulo}')
+        cantidades[codigo_articulo] = cantidades.get(codigo_articulo, 0) + int(cantidad)
+        if cantidades[codigo_articulo] > CANTIDAD_MAXIMA:
+            raise ValueError(f'Cantidad demasiado grande para el artículo {codigo_articulo}')
+    if not cantidades:
+        raise ValueError('El pedido debe tener al menos una línea')
+    max_lineas = current_app.config['PEDIDO_MAX_LINEAS']
+    if len(cantidades) > max_lineas:
+        raise ValueError(f'El pedido supera el máximo de {max_lineas} líneas')
+
+    consulta = union_all(
+        select(
+            literal('articulo').label('tipo'),
+            Articulo.codigo_articulo.label('codigo'),
+            Articulo.precio.label('precio'),
+        ).where(Articulo.codigo_articulo.in_(list(cantidades))),
+        select(
+            literal('cliente'),
+            Cliente.codigoCliente,
+            literal(None, db.Float),
+        ).where(Cliente.codigoCliente == codigo_cliente),
+    )
+    precios = {}
+    cliente_existe = False
+    for tipo, codigo, precio in db.session.execute(consulta):
+        if tipo == 'cliente':
+            cliente_existe = True
+        else:
+            precios[codigo] = precio
+
+    errores = []
+    if not cliente_existe:
+        errores.append(f'El cliente {codigo_cliente} no existe')
+    inexistentes = [codigo for codigo in cantidades if codigo not in precios]
+    if inexistentes:
+        errores.append(f'Artículos inexistentes: {", ".join(inexistentes)}')
+    if errores:
+        raise ValueError('. '.join(errores))
+
+    numero_pedido = uuid.uuid4().hex
+    hoy = date.today()
+    filas = [
+        {
+            'numero_pedido': numero_pedido,
+            'codigoCliente': codigo_cliente,
+            'codigo_articulo': codigo_articulo,
+            'cantidad': cantidad,
+            'precio_unitario': precios[codigo_articulo],
+            'fecha_pedido': hoy,
+        }
+        for codigo_articulo, cantidad in cantidades.items()
+    ]
+    try:
+        # values() con una lista genera un único INSERT ... VALUES (...), (...), ...
+        db.session.execute(insert(Pedido.__table__).values(filas))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    total = sum(fila['cantidad'] * fila['precio_unitario'] for fila in filas)
+    return {'numero_pedido': numero_pedido, 'lineas': len(filas), 'total': round(total, 2)}
+
+
+@pedidos_bp.route('/nuevo', methods=['GET', 'POST'])
+def nuevo_pedido():
+    """
+    Ruta para crear un pedido multilínea desde un formulario.
+
+    Muestra el formulario del carrito y, al enviarlo, crea todas las líneas
+    del pedido en una única transacción.
+
+    :return: Redirige a la lista de pedidos tras crearlo o renderiza el formulario.
+    """
+    form = CarritoPedidoForm()
+    if form.validate_on_submit():
+        try:
+            pedido = crear_pedido_multilinea(form.codigoCliente.data, form.lineas_parseadas)
+            flash(
+                f"Pedido {pedido['numero_pedido']} creado con {pedido['lineas']} líneas "
+                f"(total: {pedido['total']})",
+                'success'
+            )
+            return redirect(url_for('pedidos.pedidos_lista'))
+        except ValueError as e:
+            flash(str(e), 'danger')
+        except IntegrityError:
+            flash('Algún artículo o el cliente ha dejado de existir; revisa el pedido', 'danger')
+        except Exception as e:
+            logging.error(f"Error al crear el pedido del cliente {form.codigoCliente.data}: {e}")
+            flash('Error al crear el pedido', 'danger')
+    return render_template('nuevo_pedido.html', form=form)
+
+
+def _codigo_valido(valor):
+    """
+    Comprueba que un código de artículo o cliente recibido por JSON es utilizable.
+
+    :param valor: Valor recibido en el cuerpo JSON.
+    :return: True si es una cadena no vacía de como máximo 10 caracteres.
+    """
+    return isinstance(valor, str) and bool(valor.strip()) and len(valor) <= LONGITUD_MAXIMA_CODIGO
+
+
+def _parsear_lineas_json(lineas):
+    """
+    Convierte las líneas del cuerpo JSON del carrito en tuplas (codigo_articulo, cantidad).
+
+    :param lineas: Valor del campo 'lineas' del cuerpo JSON.
+    :return: Lista de tuplas (codigo_articulo, cantidad).
+    :raises ValueError: Con un mensaje apto para el cliente si alguna línea no es válida.
+    """
+    if not isinstance(lineas, list):
+        raise ValueError("El campo 'lineas' debe ser una lista")
+    resultado = []
+    for numero, linea in enumerate(lineas, start=1):
+        if not isinstance(linea, dict) or 'codigo_articulo' not in linea:
+            raise ValueError(f"Falta el campo 'codigo_articulo' en la línea {numero}")
+        if not _codigo_valido(linea['codigo_articulo']):
+            raise ValueError(
+                f"El campo 'codigo_articulo' de la línea {numero} debe ser un texto "
+                f"de 1 a {LONGITUD_MAXIMA_CODIGO} caracteres"
+            )
+        cantidad = linea.get('cantidad', 1)
+        try:
+            # bool es subclase de int: true/false no son cantidades
+            if isinstance(cantidad, bool):
+                raise TypeError
+            cantidad_entera = int(cantidad)
+            if cantidad_entera != cantidad and not isinstance(cantidad, str):
+                raise ValueError
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f'Cantidad no válida en la línea {numero}: debe ser un entero positivo')
+        resultado.append((linea['codigo_articulo'], cantidad_entera))
+    return resultado
+
+
+@pedidos_bp.route('/carrito', methods=['POST'])
+def crear_carrito():
+    """
+    Ruta JSON para crear un pedido multilínea.
+
+    Espera un cuerpo con el formato:
+        {"codigoCliente": "C001",
+         "lineas": [{"codigo_articulo": "A001", "cantidad": 2}, ...]}
+
+    :return: JSON con el número de pedido, las líneas y el total (201), el
+             error de validación (400) o un conflicto si un artículo o el
+             cliente se eliminó mientras se creaba el pedido (409).
+    """
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, dict):
+        return jsonify(error='El cuerpo debe ser un objeto JSON'), 400
+    if 'codigoCliente' not in datos:
+        return jsonify(error="Falta el campo 'codigoCliente'"), 400
+    if not _codigo_valido(datos['codigoCliente']):
+        return jsonify(
+            error=f"El campo 'codigoCliente' debe ser un texto de 1 a {LONGITUD_MAXIMA_CODIGO} caracteres"
+        ), 400
+    try:
+        lineas = _parsear_lineas_json(datos.get('lineas', []))
+        pedido = crear_pedido_multilinea(datos['codigoCliente'], lineas)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    except IntegrityError:
+        return jsonify(error='Algún artículo o el cliente ha dejado de existir; revisa el pedido'), 409
+    return jsonify(pedido), 201
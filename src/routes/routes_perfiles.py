@@ -0,0 +1,162 @@
+"""
+Rutas de administración para consultar los perfiles de peticiones.
+
+Este módulo define una pequeña página que lista los perfiles guardados por el
+perfilador (por endpoint y duración) y muestra el detalle de cada uno: las
+funciones con más tiempo de CPU y las consultas SQL más costosas. El acceso
+requiere el token de perfilado, enviado en la cabecera configurada o una vez
+como parámetro `token`. En ese caso la sesión guarda una huella del token con
+caducidad (`PERFILADO_SESION_DURACION`), de modo que cambiar el token revoca
+las sesiones abiertas. Con la SECRET_KEY por defecto la cookie podría
+falsificarse, así que solo se admite la cabecera.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import hashlib
+import hmac
+import logging
+import time
+
+from flask import (
+    Blueprint, abort, current_app, redirect, render_template, request, send_file, session, url_for
+)
+from extensions import perfilador
+
+# Valor de SECRET_KEY en config.py cuando no se define la variable de entorno
+SECRET_KEY_POR_DEFECTO = 'defaultsecretkey'
+
+# Definición del Blueprint para las rutas de administración de perfiles
+perfiles_bp = Blueprint('perfiles', __name__, template_folder='templates')
+
+
+def _huella_token():
+    """
+    Calcula la huella del token de perfilado actual que se guarda en la sesión.
+
+    Es un HMAC con la SECRET_KEY, de modo que la cookie (firmada pero legible)
+    no revela el token y deja de ser válida si el token cambia.
+
+    :return: Huella en hexadecimal.
+    """
+    return hmac.new(
+        current_app.config['SECRET_KEY'].encode(), perfilador.token.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def _sesion_valida():
+    """
+    Comprueba si la sesión se autenticó con el token actual y no ha caducado.
+
+    :return: True si la sesión da acceso a los perfiles.
+    """
+    autorizacion = session.get('perfiles_autorizado')
+    if not isinstance(autorizacion, dict):
+        return False
+    huella = autorizacion.get('huella')
+    expira = autorizacion.get('expira')
+    if not isinstance(huella, str) or not isinstance(expira, (int, float)) or expira <= time.time():
+        return False
+    return hmac.compare_digest(huella, _huella_token())
+
+
+@perfiles_bp.before_request
+def requerir_token():
+    """
+    Restringe las rutas de perfiles a quien conozca el token de perfilado.
+
+    Si no hay token configurado las rutas no existen (404). Un token válido en
+    el parámetro `token` deja en la sesión la huella del token y su caducidad,
+    y se redirige sin él para que no quede en el historial ni en los logs.
+    Con la SECRET_KEY por defecto no se usa la sesión: solo vale la cabecera.
+
+    :return: Redirección tras autenticar por parámetro, o None para continuar.
+    """
+    if not perfilador.token:
+        abort(404)
+    if perfilador.token_valido(request.headers.get(perfilador.cabecera)):
+        return None
+    sesion_segura = current_app.config.get('SECRET_KEY') not in (None, '', SECRET_KEY_POR_DEFECTO)
+    token = request.args.get('token')
+    if token is not None:
+        if not sesion_segura:
+            logging.warning(
+                'Acceso a perfiles por parámetro rechazado: define SECRET_KEY o usa '
+                f'la cabecera {perfilador.cabecera}'
+            )
+            abort(403)
+        if not perfilador.token_valido(token):
+            abort(403)
+        session['perfiles_autorizado'] = {
+            'huella': _huella_token(),
+            'expira': time.time() + current_app.config.get('PERFILADO_SESION_DURACION', 3600),
+        }
+        argumentos = request.args.to_dict()
+        argumentos.pop('token')
+        return redirect(url_for(request.endpoint, **request.view_args, **argumentos))
+    if sesion_segura and _sesion_valida():
+        return None
+    abort(403)
+
+
+@perfiles_bp.route('/')
+def perfiles_lista():
+    """
+    Ruta para mostrar los perfiles guardados.
+
+    Parámetros de consulta:
+        endpoint (str): Filtra por endpoint (opcional).
+        orden (str): 'duracion' para ordenar de más lento a más rápido; por
+                     defecto del más reciente al más antiguo.
+
+    :return: Renderiza el template con la lista de perfiles.
+    """
+    perfiles = perfilador.listar()
+    endpoints = sorted({perfil['endpoint'] for perfil in perfiles if perfil['endpoint']})
+    endpoint = request.args.get('endpoint')
+    if endpoint:
+        perfiles = [perfil for perfil in perfiles if perfil['endpoint'] == endpoint]
+    orden = request.args.get('orden')
+    if orden == 'duracion':
+        perfiles.sort(key=lambda perfil: perfil['duracion_ms'], reverse=True)
+    return render_template(
+        'perfiles.html',
+        perfiles=perfiles,
+        endpoints=endpoints,
+        endpoint=endpoint,
+        orden=orden,
+    )
+
+
+@perfiles_bp.route('/<string:id_perfil>')
+def perfil_detalle(id_perfil):
+    """
+    Ruta para mostrar el detalle de un perfil.
+
+    :param id_perfil: Identificador del perfil.
+    :return: Renderiza el template con las funciones y consultas del perfil.
+    """
+    perfil = perfilador.cargar(id_perfil)
+    if perfil is None:
+        abort(404)
+    return render_template('perfil_detalle.html', perfil=perfil)
+
+
+@perfiles_bp.route('/<string:id_perfil>/prof')
+def perfil_descargar(id_perfil):
+    """
+    Ruta para descargar el perfil de CPU completo (formato pstats).
+
+    El fichero puede abrirse con `python -m pstats` o herramientas como snakeviz.
+
+    :param id_perfil: Identificador del perfil.
+    :return: Fichero .prof como descarga.
+    """
+    ruta = perfilador.ruta_fichero(id_perfil, '.prof')
+    if ruta is None:
+        abort(404)
+    try:
+        return send_file(ruta, as_attachment=True, download_name=f'{id_perfil}.prof')
+    except FileNotFoundError:
+        abort(404)
@@ -0,0 +1,161 @@
+"""
+Rutas de sincronización incremental del catálogo.
+
+Este módulo expone el feed de cambios de artículos y clientes para que los
+terminales de venta descarguen solo las modificaciones posteriores a la
+última versión que conocen. Las respuestas se entregan en lotes compactos
+con un cursor reanudable.
+
+Autor: Francisco Diaz Guiza
+Fecha: 04/2025
+"""
+
+import click
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import insert, select
+from src.models.model_articulo import Articulo
+from src.models.model_cliente import Cliente
+from src.models.model_cambio import (
+    Cambio,
+    ContadorSync,
+    ENTIDADES_SINCRONIZABLES,
+    OPERACION_ELIMINAR,
+    OPERACION_GUARDAR,
+    reservar_versiones,
+)
+from extensions import db
+
+# Definición del Blueprint para las rutas de sincronización
+sync_bp = Blueprint('sync', __name__)
+
+
+def _feed_cambios(modelo):
+    """
+    Construye un lote del feed de cambios para un modelo sincronizable.
+
+    Lee los cambios con versión mayor que `since`, se queda con la última
+    operación de cada clave dentro del lote y recupera el estado actual de las
+    entidades guardadas con una única consulta IN.
+
+    El cursor devuelto es seguro porque las versiones se asignan en orden de
+    confirmación (ver `reservar_versiones`): una versión solo es visible
+    cuando todas las anteriores ya lo son, así que `version > since` nunca se
+    salta un cambio de una transacción que aún no había confirmado. Con un
+    autoincremental no sería así: T1 obtiene 10, T2 obtiene 11 y confirma
+    antes, y un cliente que leyera en ese momento avanzaría a 11 perdiendo 10.
+
+    :param modelo: Clase del modelo (Articulo o Cliente).
+    :return: Respuesta JSON con los cambios, el cursor y si quedan más lotes.
+    """
+    entidad, atributo = ENTIDADES_SINCRONIZABLES[modelo]
+    since = max(request.args.get('since', 0, type=int), 0)
+    limite = request.args.get('limite', current_app.config['SYNC_TAMANO_LOTE'], type=int)
+    limite = min(max(limite, 1), current_app.config['SYNC_TAMANO_LOTE_MAX'])
+
+    cambios = (
+        Cambio.query
+        .filter(Cambio.entidad == entidad, Cambio.version > since)
+        .order_by(Cambio.version)
+        .limit(limite + 1)
+        .all()
+    )
+    hay_mas = len(cambios) > limite
+    cambios = cambios[:limite]
+
+    # Compacta el lote: solo interesa la última operación de cada clave
+    ultimos = {}
+    for cambio in cambios:
+        ultimos.pop(cambio.clave, None)
+        ultimos[cambio.clave] = cambio
+
+    claves_guardadas = [
+        clave for clave, cambio in ultimos.items()
+        if cambio.operacion == OPERACION_GUARDAR
+    ]
+    columna_clave = getattr(modelo, atributo)
+    actuales = {}
+    if claves_guardadas:
+        actuales = {
+            getattr(objeto, atributo): objeto
+            for objeto in modelo.query.filter(columna_clave.in_(claves_guardadas)).all()
+        }
+
+    resultado = []
+    for clave, cambio in ultimos.items():
+        objeto = actuales.get(clave)
+        if cambio.operacion == OPERACION_GUARDAR and objeto is not None:
+            resultado.append({
+                'version': cambio.version,
+                'operacion': OPERACION_GUARDAR,
+                'clave': clave,
+                'datos': objeto.serializar(),
+            })
+        else:
+            # Eliminado explícitamente o borrado después de este lote
+            resultado.append({
+                'version': cambio.version,
+                'operacion': OPERACION_ELIMINAR,
+                'clave': clave,
+            })
+
+    return jsonify(
+        cambios=resultado,
+        cursor=cambios[-1].version if cambios else since,
+        hay_mas=hay_mas,
+    )
+
+
+@sync_bp.route('/articulos')
+def sync_articulos():
+    """
+    Ruta para descargar los cambios de artículos desde una versión dada.
+
+    Parámetros de consulta:
+        since (int): Última versión conocida por el cliente (0 para empezar).
+        limite (int): Número máximo de cambios a leer en este lote.
+
+    :return: JSON con 'cambios', 'cursor' (valor de `since` para el siguiente
+             lote) y 'hay_mas'.
+    """
+    return _feed_cambios(Articulo)
+
+
+@sync_bp.route('/clientes')
+def sync_clientes():
+    """
+    Ruta para descargar los cambios de clientes desde una versión dada.
+
+    Acepta los mismos parámetros y devuelve el mismo formato que
+    `sync_articulos`.
+
+    :return: JSON con 'cambios', 'cursor' y 'hay_mas'.
+    """
+    return _feed_cambios(Cliente)
+
+
+@sync_bp.cli.command('inicializar')
+def inicializar_feed():
+    """
+    Crea la fila del contador y registra un cambio 'guardar' por cada artículo y cliente.
+
+    Debe ejecutarse una vez tras crear las tablas con las migraciones (con
+    `db.create_all()` la fila del contador ya se crea junto a su tabla) para
+    que los datos previos al feed también se entreguen a los clientes que
+    sincronizan desde la versión 0. Uso: `flask sync inicializar`.
+    """
+    tabla_contador = ContadorSync.__table__
+    if db.session.execute(select(tabla_contador.c.id)).first() is None:
+        db.session.execute(insert(tabla_contador).values(id=1, version=0))
+    registros = []
+    for modelo, (entidad, atributo) in ENTIDADES_SINCRONIZABLES.items():
+        claves = db.session.execute(select(getattr(modelo, atributo))).scalars().all()
+        registros.extend((entidad, clave) for clave in claves)
+    if registros:
+        # Las versiones salen del mismo contador que usan las escrituras normales
+        primera = reservar_versiones(db.session.connection(), len(registros))
+        db.session.add_all(
+            Cambio(version=version, entidad=entidad, clave=clave, operacion=OPERACION_GUARDAR)
+            for version, (entidad, clave) in enumerate(registros, start=primera)
+        )
+    db.session.commit()
+    click.echo('Feed de cambios inicializado.')